@@ -2,26 +2,47 @@
 Power profiling module for HPC benchmarking.
 """
 
+# Base / no-op monitors
+from .monitors.base import BasePowerMonitor, NullPowerMonitor
+
 # CPU monitors
 from .monitors.cpu import CPUMonitor, IntelMonitor, AMDMonitor
 
 # GPU monitors
 from .monitors.gpu import GPUMonitor, NvidiaGPUMonitor, AMDGPUMonitor
 
-# System monitors (Redfish/IDRAC in-band removed; use out-of-band wrapper for iDRAC)
-from .monitors.system import SystemMonitor, IPMIMonitor
-from .outofband import IDRACRemoteClient, IDRACQueryParams
+# System monitors
+from .monitors.system import SystemMonitor, IPMIMonitor, IpmitoolMonitor, RedfishMonitor
+
+# Shared sampling reactor
+from .monitors.reactor import MonitorReactor, build_monitors
 
 __all__ = [
+    # Base / no-op monitors
+    'BasePowerMonitor', 'NullPowerMonitor',
+
     # CPU monitors
     'CPUMonitor', 'IntelMonitor', 'AMDMonitor',
-    
+
     # GPU monitors
     'GPUMonitor', 'NvidiaGPUMonitor', 'AMDGPUMonitor',
-    
+
     # System monitors
-    'SystemMonitor', 'IPMIMonitor',
+    'SystemMonitor', 'IPMIMonitor', 'IpmitoolMonitor', 'RedfishMonitor',
+
+    # Shared sampling reactor
+    'MonitorReactor', 'build_monitors',
 
     # Out-of-band
     'IDRACRemoteClient', 'IDRACQueryParams'
-] 
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    # The out-of-band client drags in the REPACSS submodule plus its DB/SSH
+    # stack (psycopg2, paramiko, sshtunnel); resolve it lazily (PEP 562) so
+    # in-band-only users never pay that import.
+    if name in ('IDRACRemoteClient', 'IDRACQueryParams'):
+        from . import outofband
+        return getattr(outofband, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
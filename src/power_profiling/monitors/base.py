@@ -2,39 +2,85 @@
 
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
+import os
 import time
 import threading
-from dataclasses import dataclass
-from datetime import datetime
 from ..utils.logging_config import get_logger
 import logging
-import statistics
+
+import numpy as np
 
 from ..utils.power_reading import PowerReading
+from ..utils.sample_ring import SampleRing, write_spool
+
+# Sample timestamps come from the monotonic clock, anchored to the epoch
+# once at import: wall time follows NTP steps and slew, so time.time_ns()
+# spacing is non-uniform and can even run backwards, which biases
+# trapezoidal energy integrals. CLOCK_MONOTONIC_RAW additionally ignores
+# NTP rate adjustment where the platform offers it. functools.partial
+# binds the real clock function so test doubles for this module's `time`
+# do not disturb the timestamp axis.
+if hasattr(time, 'CLOCK_MONOTONIC_RAW'):
+    import functools
+    _monotonic_ns = functools.partial(time.clock_gettime_ns,
+                                      time.CLOCK_MONOTONIC_RAW)
+else:
+    _monotonic_ns = time.monotonic_ns
+
+_EPOCH_ANCHOR_NS = time.time_ns() - _monotonic_ns()
+
+
+def sample_timestamp_ns() -> int:
+    """Epoch nanoseconds on a monotonic axis, immune to clock steps."""
+    return _monotonic_ns() + _EPOCH_ANCHOR_NS
+
+
+# Ceiling for the failure backoff below: an unreachable BMC or lost GPU
+# is retried at most this often instead of at the full sampling rate.
+_MAX_BACKOFF = 30.0
 
-@dataclass
-class PowerReading:
-    timestamp: datetime
-    power_watts: float
-    metadata: Dict[str, Any]
 
 class BasePowerMonitor(ABC):
     """Abstract base class for power monitors."""
 
-    def __init__(self, sampling_interval: float = 1.0):
+    def __init__(self, sampling_interval: float = 1.0, monitor_cpu: Optional[int] = None,
+                 max_samples: int = 65536, spool_path: Optional[str] = None,
+                 max_retries: int = 3, coalesce: bool = False):
         """Initialize the power monitor.
-        
+
         Args:
             sampling_interval: Time between readings in seconds
+            monitor_cpu: CPU to pin the sampling thread to. Defaults to the
+                last online CPU so the monitor does not share a core with
+                the benchmark being measured.
+            max_samples: Ring capacity between drains; the oldest samples
+                are overwritten once it fills, bounding memory for
+                arbitrarily long runs.
+            spool_path: When set, drained samples are batch-written to this
+                binary file (see sample_ring.read_spool) instead of being
+                retained in RAM as PowerReading objects.
+            max_retries: Attempts per reading in _read_with_retry
+            coalesce: Run-length encode steady-state readings in the ring
+                (see SampleRing); runs of an unchanged value keep only
+                their first sample and a sliding boundary sample
         """
         self.sampling_interval = sampling_interval
+        self.monitor_cpu = monitor_cpu
+        self.max_samples = max_samples
+        self.spool_path = spool_path
+        self._spool = open(spool_path, 'wb') if spool_path else None
+        self._drain_lock = threading.Lock()
+        # Samples are staged in a lock-free SPSC ring by the sampling thread
+        # and drained into `readings`/`power_data` (one shared list) by the
+        # consumer, so the hot loop never contends with readers.
+        self._ring = SampleRing(max_samples, coalesce=coalesce)
         self.readings: List[PowerReading] = []
+        self.power_data = self.readings
         self.logger = logging.getLogger(__name__)
         self._is_running = False
-        self.max_retries = 3
+        self.max_retries = max_retries
         self.running = False
         self.thread = None
-        self.power_data: List[PowerReading] = []
         self.logger.info(f"Initializing {self.__class__.__name__} with sampling_interval={sampling_interval}s")
         
     @abstractmethod
@@ -51,54 +97,167 @@ class BasePowerMonitor(ABC):
             try:
                 reading = self._read_power()
                 if reading is not None:
-                    self.logger.debug(f"Power reading: {reading:.2f}W")
+                    self.logger.debug("Power reading: %.2fW", reading)
                 return reading
             except Exception as e:
-                self.logger.warning(f"Attempt {attempt + 1}/{self.max_retries} failed: {str(e)}")
+                self.logger.warning("Attempt %d/%d failed: %s", attempt + 1, self.max_retries, e)
                 if attempt == self.max_retries - 1:
-                    self.logger.error(f"Failed to read power after {self.max_retries} attempts: {e}")
+                    self.logger.error("Failed to read power after %d attempts: %s", self.max_retries, e)
                     return None
                 time.sleep(0.1)  # Short delay between retries
     
+    @staticmethod
+    def _backoff_interval(interval: float, fail_streak: int) -> float:
+        """Sampling interval stretched exponentially during a failure streak.
+
+        Doubles per consecutive failed read up to _MAX_BACKOFF (never
+        below the configured interval itself), so a dead or unreachable
+        power source is not hammered at the full sampling rate (each
+        attempt may cost a subprocess or network timeout). Resets to the
+        plain interval on the first success.
+        """
+        if not fail_streak:
+            return interval
+        return min(interval * (2.0 ** min(fail_streak, 16)),
+                   max(interval, _MAX_BACKOFF))
+
+    def _pin_monitor_thread(self) -> None:
+        """Pin the sampling thread to a housekeeping CPU and lower its priority.
+
+        Sampling alongside an HPC workload on the same cores perturbs the very
+        code being measured. Pinning the (tiny, periodic) monitor thread to a
+        single CPU and yielding scheduling priority keeps it off the worker
+        cores. Must be called from inside the sampling thread.
+        """
+        if not hasattr(os, 'sched_setaffinity'):
+            return
+        try:
+            cpu = self.monitor_cpu
+            if cpu is None:
+                cpu = max(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cpu})
+            os.nice(19)
+            self.logger.debug("Monitor thread pinned to CPU %d", cpu)
+        except OSError as e:
+            self.logger.warning(f"Could not pin monitor thread: {e}")
+
     def _monitor_loop(self):
-        """Monitor loop that collects power data at regular intervals"""
+        """Monitor loop that collects power data at regular intervals.
+
+        Samples are scheduled against absolute monotonic deadlines rather
+        than sleeping a fixed interval after each read, so per-sample read
+        latency does not accumulate as drift over the run.
+        """
         self.logger.info("Starting monitor loop")
+        self._pin_monitor_thread()
         last_reading = None
         last_time = time.time()
-        
+        fail_streak = 0
+        next_deadline = time.monotonic() + self.sampling_interval
+
         while self.running:
             current_reading = self._read_with_retry()
             current_time = time.time()
-            
+            fail_streak = fail_streak + 1 if current_reading is None else 0
+
             if current_reading is not None and last_reading is not None:
                 # Calculate power in watts
                 time_diff = current_time - last_time
                 energy_diff = current_reading - last_reading
                 power = energy_diff / time_diff
-                
-                # Create power reading with metadata
-                reading = PowerReading(
-                    timestamp=datetime.now(),
-                    power_watts=power,
-                    metadata=self._get_metadata()
-                )
-                self.power_data.append(reading)
-                self.logger.debug(f"Recorded power reading: {power:.2f}W")
-            
+
+                # Stage the sample in the ring; drained on stop()
+                self._ring.push(sample_timestamp_ns(), power, self._get_metadata())
+                self.logger.debug("Recorded power reading: %.2fW", power)
+
             last_reading = current_reading
             last_time = current_time
-            time.sleep(self.sampling_interval)
-        
+            step = self._backoff_interval(self.sampling_interval, fail_streak)
+            delay = next_deadline - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+                next_deadline += step
+            else:
+                # Fell behind (slow read); resynchronize instead of bursting
+                next_deadline = time.monotonic() + step
+
         self.logger.info("Monitor loop stopped")
     
     @abstractmethod
     def _get_metadata(self) -> Dict[str, Any]:
         """Get metadata about the current reading"""
         pass
-    
+
+    def _sample_once(self) -> None:
+        """Take one sample synchronously.
+
+        Used by MonitorReactor to drive many monitors from a single thread;
+        the per-monitor collection loops inline the same steps. A failed
+        read (None) stores nothing: the ring's float64 array would coerce
+        None to NaN, poisoning the statistics.
+        """
+        power = self._read_power()
+        if power is None:
+            return
+        self._ring.push(sample_timestamp_ns(), power, self._get_metadata())
+
+    def snapshot_samples(self):
+        """Copy the samples currently staged in the ring without consuming them.
+
+        Returns:
+            Tuple of (timestamps_ns, power_watts, metadata): two NumPy arrays
+            plus the matching metadata list, suitable for vectorized analysis
+            while the monitor is still running.
+        """
+        return self._ring.snapshot()
+
+    def _drain_ring(self) -> List[PowerReading]:
+        """Drain staged samples into the readings list or the spool file.
+
+        The lock only serializes competing drainers (stop(), flush(),
+        get_statistics()); the sampling thread never takes it.
+        """
+        with self._drain_lock:
+            if self._spool is not None:
+                ts, power, _ = self._ring.drain()
+                if len(ts):
+                    write_spool(self._spool, ts, power)
+                return self.readings
+            drained = self._ring.drain_readings()
+            if drained:
+                self.readings.extend(drained)
+            return self.readings
+
+    def flush(self) -> None:
+        """Drain staged samples, pushing them through to disk when spooling.
+
+        Safe to call periodically during long spooled runs to keep the ring
+        from wrapping.
+        """
+        self._drain_ring()
+        if self._spool is not None:
+            self._spool.flush()
+
+    def close(self) -> None:
+        """Flush and release the spool file handle.
+
+        Called by stop(); safe to call repeatedly. start() reopens the
+        spool in append mode, so stop/start cycles neither leak file
+        descriptors nor truncate earlier samples.
+        """
+        if self._spool is not None:
+            self._spool.close()
+            self._spool = None
+
+    def _reopen_spool(self) -> None:
+        """Reopen the spool in append mode after a close()."""
+        if self.spool_path and self._spool is None:
+            self._spool = open(self.spool_path, 'ab')
+
     def start(self) -> None:
         """Start collecting power readings."""
         if not self.running:
+            self._reopen_spool()
             self.running = True
             self.thread = threading.Thread(target=self._monitor_loop)
             self.thread.daemon = True
@@ -117,11 +276,13 @@ class BasePowerMonitor(ABC):
             self.running = False
             if self.thread:
                 self.thread.join(timeout=1.0)
+            self._drain_ring()
+            self.close()
             self.logger.info(f"{self.__class__.__name__} stopped")
             self.logger.info(f"Collected {len(self.power_data)} power readings")
         else:
             self.logger.warning(f"{self.__class__.__name__} is not running")
-        
+
         return self.power_data
     
     def get_statistics(self) -> Dict[str, float]:
@@ -130,6 +291,7 @@ class BasePowerMonitor(ABC):
         Returns:
             Dictionary containing statistics
         """
+        self._drain_ring()
         if not self.power_data:
             self.logger.warning("No power data available for statistics")
             return {
@@ -139,20 +301,25 @@ class BasePowerMonitor(ABC):
                 'total_energy': 0.0
             }
 
-        powers = [r.power_watts for r in self.power_data]
-        
+        # One fromiter pass plus C-level reductions; at hours of samples
+        # this beats per-reading Python arithmetic by orders of magnitude
+        count = len(self.power_data)
+        powers = np.fromiter((r.power_watts for r in self.power_data),
+                             dtype=np.float64, count=count)
+
         # Calculate time duration in seconds
-        if len(self.power_data) > 1:
-            duration = (self.power_data[-1].timestamp - 
-                      self.power_data[0].timestamp).total_seconds()
+        if count > 1:
+            duration = (self.power_data[-1].timestamp_ns -
+                        self.power_data[0].timestamp_ns) / 1e9
         else:
             duration = 0.0
 
+        average = float(powers.mean())
         return {
-            'average': statistics.mean(powers),
-            'peak': max(powers),
-            'min': min(powers),
-            'total_energy': statistics.mean(powers) * duration  # Joules = Watts * seconds
+            'average': average,
+            'peak': float(powers.max()),
+            'min': float(powers.min()),
+            'total_energy': average * duration  # Joules = Watts * seconds
         }
 
     def is_running(self) -> bool:
@@ -165,4 +332,28 @@ class BasePowerMonitor(ABC):
 
     def clear(self) -> None:
         """Clear all collected readings."""
-        self.power_data = [] 
\ No newline at end of file
+        self._ring.clear()
+        self.readings.clear()
+
+
+class NullPowerMonitor(BasePowerMonitor):
+    """Monitor that reads no hardware at all.
+
+    Drop-in stand-in for hosts without a usable power interface (CI
+    runners, dev laptops): the sampling machinery behaves normally,
+    every reading is None, and calling code keeps a single code path
+    instead of hardware-availability branches around each monitor.
+    """
+
+    def __init__(self, sampling_interval: float = 1.0, **kwargs):
+        super().__init__(sampling_interval, **kwargs)
+        self._static_metadata = {
+            'monitor_type': 'null',
+            'sampling_interval': self.sampling_interval
+        }
+
+    def _read_power(self) -> Optional[float]:
+        return None
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        return self._static_metadata
\ No newline at end of file
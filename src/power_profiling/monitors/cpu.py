@@ -4,16 +4,24 @@ import os
 import time
 import threading
 from typing import Optional, Dict, Any, List
-from .base import BasePowerMonitor
+from .base import BasePowerMonitor, sample_timestamp_ns
 from ..utils.power_reading import PowerReading
 from ..utils.logging_config import get_logger
 import psutil
-from datetime import datetime
+
+# Hardware probes, run once at import: the RAPL and k10temp sysfs layout
+# cannot change while a process runs, so re-stat'ing per instance (or per
+# test) is wasted. Tests patch these flags instead of os.path.exists.
+_RAPL_BASE_PATH = "/sys/class/powercap/intel-rapl"
+_HAS_INTEL_RAPL = os.path.isdir(_RAPL_BASE_PATH)
+_K10TEMP_PATH = '/sys/class/hwmon/hwmon0'
+_HAS_K10TEMP = os.path.exists(_K10TEMP_PATH)
 
 class CPUMonitor(BasePowerMonitor):
     """Abstract base class for CPU power monitoring."""
-    def __init__(self, sampling_interval: float = 1.0):
-        super().__init__(sampling_interval)
+    def __init__(self, sampling_interval: float = 1.0, monitor_cpu: Optional[int] = None,
+                 **kwargs):
+        super().__init__(sampling_interval, monitor_cpu, **kwargs)
         self.logger = get_logger(__name__)
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
@@ -23,31 +31,63 @@ class CPUMonitor(BasePowerMonitor):
 
     def _get_metadata(self) -> Dict[str, Any]:
         return {"monitor_type": "abstract_cpu", "sampling_interval": self.sampling_interval}
-    
+
+    def _sample_once(self) -> None:
+        """Take one CPU sample synchronously, skipping failed (None) reads."""
+        power = self._read_power()
+        if power is None:
+            return
+        freq = psutil.cpu_freq()
+        self._ring.push(sample_timestamp_ns(), power, {
+            'cpu_percent': psutil.cpu_percent(),
+            'frequency': freq.current if freq else 0
+        })
+
     def _collect_readings(self) -> None:
-        """Collect CPU power readings in a separate thread."""
-        while not self._stop_event.is_set():
+        """Collect CPU power readings in a separate thread.
+
+        Scheduled against monotonic deadlines so read latency does not
+        accumulate as sampling drift.
+        """
+        self._pin_monitor_thread()
+        # Bind hot-loop lookups to locals (LOAD_FAST instead of LOAD_ATTR)
+        read_power = self._read_power
+        push = self._ring.push
+        stopping = self._stop_event.is_set
+        wait = self._stop_event.wait
+        cpu_percent = psutil.cpu_percent
+        cpu_freq = psutil.cpu_freq
+        monotonic = time.monotonic
+        time_ns = sample_timestamp_ns
+        interval = self.sampling_interval
+        next_deadline = monotonic() + interval
+        while not stopping():
             try:
-                power = self._read_power()
-                
-                reading = PowerReading(
-                    timestamp=datetime.now(),
-                    power_watts=power,
-                    metadata={
-                        'cpu_percent': psutil.cpu_percent(),
-                        'frequency': psutil.cpu_freq().current if psutil.cpu_freq() else 0
-                    }
-                )
-                self.readings.append(reading)
+                power = read_power()
+                if power is not None:
+                    # A None read stores nothing: the ring's float64 array
+                    # would coerce it to NaN
+                    freq = cpu_freq()
+                    push(time_ns(), power, {
+                        'cpu_percent': cpu_percent(),
+                        'frequency': freq.current if freq else 0
+                    })
 
             except Exception as e:
-                self.logger.error(f"Error collecting CPU reading: {e}")
+                self.logger.error("Error collecting CPU reading: %s", e)
 
-            time.sleep(self.sampling_interval)
+            delay = next_deadline - monotonic()
+            if delay > 0:
+                if wait(delay):
+                    return
+                next_deadline += interval
+            else:
+                next_deadline = monotonic() + interval
 
     def start(self) -> None:
         """Start collecting CPU power readings."""
         if not self._thread or not self._thread.is_alive():
+            self._reopen_spool()
             self._stop_event.clear()
             self._thread = threading.Thread(target=self._collect_readings)
             self._thread.daemon = True
@@ -66,19 +106,34 @@ class CPUMonitor(BasePowerMonitor):
             self._stop_event.set()
             self._thread.join()
             self.logger.info("CPU monitoring stopped")
-        return self.readings
+        readings = self._drain_ring()
+        self.close()
+        return readings
 
 class IntelMonitor(CPUMonitor):
     """Monitor CPU power using Intel RAPL energy counters."""
-    def __init__(self, sampling_interval: float = 0.1, domain: Optional[str] = None):
-        super().__init__(sampling_interval)
-        self.rapl_base_path = "/sys/class/powercap/intel-rapl"
+    def __init__(self, sampling_interval: float = 0.1, domain: Optional[str] = None,
+                 adaptive_sampling: bool = False, stability_band_watts: float = 0.5,
+                 monitor_cpu: Optional[int] = None, **kwargs):
+        super().__init__(sampling_interval, monitor_cpu, **kwargs)
+        self.adaptive_sampling = adaptive_sampling
+        self.stability_band_watts = stability_band_watts
+        self.rapl_base_path = _RAPL_BASE_PATH
+        if not _HAS_INTEL_RAPL:
+            raise RuntimeError("RAPL sysfs interface not found. Ensure your CPU supports RAPL and it's enabled.")
         self.domain, self.energy_path, self.max_energy = self._find_rapl_domain(domain)
         self._last_energy = None
         self._last_time = None
-        
-        if not os.path.exists(self.rapl_base_path):
-            raise RuntimeError("RAPL sysfs interface not found. Ensure your CPU supports RAPL and it's enabled.")
+
+        # Keep the energy counter open for the lifetime of the monitor so the
+        # sampling tick is a single pread instead of open/read/close.
+        self._energy_fd = os.open(self.energy_path, os.O_RDONLY)
+        self._last_energy_uj: Optional[int] = None
+        self._last_tick_ns: Optional[int] = None
+        # Metadata is identical for every sample; resolve it once (including
+        # the /proc/cpuinfo model lookup) so the sampling tick attaches the
+        # shared template instead of rebuilding the dict per sample.
+        self._static_metadata = self._get_metadata()
     
     def _find_rapl_domain(self, domain: Optional[str]):
         """Find the RAPL domain path and max energy."""
@@ -123,12 +178,92 @@ class IntelMonitor(CPUMonitor):
     def _read_power(self) -> Optional[float]:
         """Read power from Intel RAPL"""
         try:
-            with open(self.energy_path, 'r') as f:
-                energy_uj = int(f.read().strip())
+            energy_uj = int(os.pread(self._energy_fd, 32, 0))
             return energy_uj / 1e6  # Convert microjoules to joules
         except Exception as e:
-            self.logger.error(f"Error reading RAPL power: {e}", exc_info=True)
+            self.logger.error("Error reading RAPL power: %s", e, exc_info=True)
+            return None
+
+    def _sample_tick(self, timestamp_ns: int) -> Optional[float]:
+        """One complete sampling tick: pread, wrap-corrected delta, ring store.
+
+        The whole tick is a single syscall plus a handful of int operations,
+        so it stays cheap enough for high-frequency sampling. Returns the
+        derived watts, or None for the priming read.
+        """
+        energy_uj = int(os.pread(self._energy_fd, 32, 0))
+        last_energy = self._last_energy_uj
+        last_ns = self._last_tick_ns
+        self._last_energy_uj = energy_uj
+        self._last_tick_ns = timestamp_ns
+        if last_energy is None:
             return None
+        delta_uj = energy_uj - last_energy
+        if delta_uj < 0:
+            # Counter wrapped at max_energy_range_uj
+            delta_uj += self.max_energy
+        # uJ / ns * 1e3 == W
+        watts = delta_uj * 1e3 / (timestamp_ns - last_ns)
+        self._ring.push(timestamp_ns, watts, self._static_metadata)
+        return watts
+
+    def _sample_once(self) -> None:
+        """Take one RAPL sample synchronously."""
+        self._sample_tick(sample_timestamp_ns())
+
+    def _collect_readings(self) -> None:
+        """Collect RAPL power readings in a tight per-tick loop.
+
+        With adaptive_sampling enabled the interval is stretched (up to 8x)
+        while successive readings stay inside stability_band_watts, and
+        snapped back to the base interval as soon as power moves. Steady
+        phases cost almost no samples; transients are still captured at the
+        configured rate.
+        """
+        self._pin_monitor_thread()
+        tick = self._sample_tick
+        should_stop = self._stop_event.wait
+        monotonic = time.monotonic
+        base_interval = self.sampling_interval
+        max_interval = base_interval * 8
+        band = self.stability_band_watts
+        adaptive = self.adaptive_sampling
+        time_ns = sample_timestamp_ns
+        interval = base_interval
+        last_watts = None
+        next_deadline = monotonic() + interval
+        while True:
+            try:
+                watts = tick(time_ns())
+                if adaptive and watts is not None:
+                    if last_watts is not None and abs(watts - last_watts) < band:
+                        interval = min(interval * 2, max_interval)
+                    else:
+                        interval = base_interval
+                    last_watts = watts
+            except Exception as e:
+                self.logger.error("Error collecting CPU reading: %s", e)
+            # Deadline-based schedule: tick latency eats into the interval
+            # instead of stretching it, so the cadence never drifts.
+            next_deadline += interval
+            delay = next_deadline - monotonic()
+            if delay <= 0:
+                # Fell behind; resynchronize instead of bursting — but still
+                # observe stop requests, or a tick persistently slower than
+                # the interval wedges this thread (and stop()'s join)
+                if should_stop(0):
+                    return
+                next_deadline = monotonic()
+                continue
+            if should_stop(delay):
+                return
+
+    def __del__(self):
+        """Close the persistent RAPL file descriptor."""
+        try:
+            os.close(self._energy_fd)
+        except (AttributeError, OSError):
+            pass
 
     def _get_metadata(self) -> Dict[str, Any]:
         metadata = {
@@ -156,11 +291,12 @@ class IntelMonitor(CPUMonitor):
 
 class AMDMonitor(CPUMonitor):
     """Monitor CPU power using AMD K10Temp interface."""
-    def __init__(self, sampling_interval: float = 0.1):
-        super().__init__(sampling_interval)
-        self.amd_path = '/sys/class/hwmon/hwmon0'
-        
-        if not os.path.exists(self.amd_path):
+    def __init__(self, sampling_interval: float = 0.1, monitor_cpu: Optional[int] = None,
+                 **kwargs):
+        super().__init__(sampling_interval, monitor_cpu, **kwargs)
+        self.amd_path = _K10TEMP_PATH
+
+        if not _HAS_K10TEMP:
             raise RuntimeError("AMD hwmon interface not found. Ensure your CPU supports AMD power monitoring.")
         
         # Verify it's an AMD processor
@@ -170,22 +306,38 @@ class AMDMonitor(CPUMonitor):
                     raise RuntimeError("AMD K10Temp interface not found")
         except (IOError, ValueError) as e:
             raise RuntimeError(f"Error checking AMD interface: {e}")
-    
+
+        # Keep power1_input open so each sample is one pread instead of
+        # open/read/close (three syscalls and a path lookup per tick).
+        self.power_path = os.path.join(self.amd_path, 'power1_input')
+        try:
+            self._power_fd: Optional[int] = os.open(self.power_path, os.O_RDONLY)
+        except OSError as e:
+            self.logger.warning(f"Could not open {self.power_path}: {e}")
+            self._power_fd = None
+
     def _read_power(self) -> Optional[float]:
         """Read power from AMD K10Temp"""
         try:
-            # Read CPU power from hwmon
-            power_path = os.path.join(self.amd_path, 'power1_input')
-            self.logger.debug(f"Reading AMD power from: {power_path}")
-            
-            with open(power_path, 'r') as f:
-                power = int(f.read().strip())
+            if self._power_fd is not None:
+                power = int(os.pread(self._power_fd, 32, 0))
+            else:
+                with open(self.power_path, 'r') as f:
+                    power = int(f.read().strip())
             power_watts = power / 1e6  # Convert microwatts to watts
-            self.logger.debug(f"AMD power reading: {power} microwatts")
+            self.logger.debug("AMD power reading: %d microwatts", power)
             return power_watts
-        except (IOError, ValueError) as e:
-            self.logger.error(f"Error reading AMD power: {e}", exc_info=True)
+        except (OSError, ValueError) as e:
+            self.logger.error("Error reading AMD power: %s", e, exc_info=True)
             return None
+
+    def __del__(self):
+        """Close the persistent hwmon file descriptor."""
+        try:
+            if self._power_fd is not None:
+                os.close(self._power_fd)
+        except (AttributeError, OSError):
+            pass
     
     def _get_metadata(self) -> Dict[str, Any]:
         metadata = {
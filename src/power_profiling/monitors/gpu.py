@@ -4,11 +4,9 @@ import os
 import time
 import threading
 import logging
-import subprocess
-import json
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional, Dict, Any, List
-from datetime import datetime
-from .base import BasePowerMonitor, PowerReading
+from .base import BasePowerMonitor, PowerReading, sample_timestamp_ns
 
 try:
     import pynvml
@@ -16,17 +14,50 @@ try:
 except ImportError:
     NVML_AVAILABLE = False
 
+# NVML is initialized once per process and shared by all monitors; the
+# refcount makes shutdown happen exactly when the last monitor goes away
+# instead of the first __del__ killing the library under live monitors.
+_nvml_lock = threading.Lock()
+_nvml_refcount = 0
+
+
+def _nvml_acquire() -> None:
+    """Initialize NVML on first use; subsequent calls only bump the refcount."""
+    global _nvml_refcount
+    with _nvml_lock:
+        if _nvml_refcount == 0:
+            pynvml.nvmlInit()
+        _nvml_refcount += 1
+
+
+def _nvml_release() -> None:
+    """Drop one NVML reference, shutting the library down on the last one."""
+    global _nvml_refcount
+    with _nvml_lock:
+        if _nvml_refcount == 0:
+            return
+        _nvml_refcount -= 1
+        if _nvml_refcount == 0:
+            try:
+                pynvml.nvmlShutdown()
+            except pynvml.NVMLError:
+                pass
+
 class GPUMonitor(BasePowerMonitor):
     """Base class for GPU power monitoring."""
     
-    def __init__(self, sampling_interval: float = 1.0, device_index: int = 0):
+    def __init__(self, sampling_interval: float = 1.0, device_index: int = 0,
+                 monitor_cpu: Optional[int] = None, **kwargs):
         """Initialize the GPU monitor.
-        
+
         Args:
             sampling_interval: Time between readings in seconds
             device_index: Index of the GPU to monitor
+            monitor_cpu: CPU to pin the sampling thread to
+            **kwargs: Ring and spool options forwarded to BasePowerMonitor
+                (max_samples, spool_path, coalesce, ...)
         """
-        super().__init__(sampling_interval)
+        super().__init__(sampling_interval, monitor_cpu, **kwargs)
         self.device_index = device_index
         self.logger = logging.getLogger(__name__)
         self._stop_event = threading.Event()
@@ -45,26 +76,54 @@ class GPUMonitor(BasePowerMonitor):
         }
     
     def _collect_readings(self) -> None:
-        """Collect GPU power readings in a separate thread."""
-        while not self._stop_event.is_set():
+        """Collect GPU power readings in a separate thread.
+
+        Scheduled against monotonic deadlines so read latency does not
+        accumulate as sampling drift.
+        """
+        self._pin_monitor_thread()
+        # Bind hot-loop lookups to locals (LOAD_FAST instead of LOAD_ATTR)
+        read_power = self._read_power
+        push = self._ring.push
+        stopping = self._stop_event.is_set
+        wait = self._stop_event.wait
+        get_metadata = self._get_metadata
+        monotonic = time.monotonic
+        time_ns = sample_timestamp_ns
+        backoff = self._backoff_interval
+        interval = self.sampling_interval
+        fail_streak = 0
+        next_deadline = monotonic() + interval
+        while not stopping():
             try:
-                power = self._read_power()
-                
-                reading = PowerReading(
-                    timestamp=datetime.now(),
-                    power_watts=power,
-                    metadata=self._get_metadata()
-                )
-                self.readings.append(reading)
-                
+                power = read_power()
+                if power is None:
+                    # The ring's float64 array would coerce None to NaN;
+                    # record nothing and count it toward the streak
+                    fail_streak += 1
+                else:
+                    push(time_ns(), power, get_metadata())
+                    fail_streak = 0
+
             except Exception as e:
-                self.logger.error(f"Error collecting GPU reading: {e}")
-                
-            time.sleep(self.sampling_interval)
+                fail_streak += 1
+                self.logger.error("Error collecting GPU reading: %s", e)
+
+            # Exponentially back off while the source is failing so a dead
+            # sensor is not hammered at the full sampling rate
+            step = backoff(interval, fail_streak)
+            delay = next_deadline - monotonic()
+            if delay > 0:
+                if wait(delay):
+                    return
+                next_deadline += step
+            else:
+                next_deadline = monotonic() + step
 
     def start(self) -> None:
         """Start collecting GPU power readings."""
         if not self._thread or not self._thread.is_alive():
+            self._reopen_spool()
             self._stop_event.clear()
             self._thread = threading.Thread(target=self._collect_readings)
             self._thread.daemon = True
@@ -83,176 +142,401 @@ class GPUMonitor(BasePowerMonitor):
             self._stop_event.set()
             self._thread.join()
             self.logger.info("GPU monitoring stopped")
-            
-        return self.readings
+
+        readings = self._drain_ring()
+        self.close()
+        return readings
 
 class NvidiaGPUMonitor(GPUMonitor):
     """Monitor NVIDIA GPU power consumption using NVIDIA Management Library."""
 
-    def __init__(self, sampling_interval: float = 1.0, device_index: int = 0):
+    def __init__(self, sampling_interval: float = 1.0, device_index: int = 0,
+                 monitor_cpu: Optional[int] = None, gpu_ids: Optional[List[int]] = None,
+                 use_hw_samples: bool = False, **kwargs):
         """Initialize the NVIDIA GPU monitor.
-        
+
         Args:
             sampling_interval: Time between readings in seconds
-            device_index: Index of the GPU to monitor
-        
+            device_index: Index of the GPU to monitor (ignored when gpu_ids
+                is given)
+            monitor_cpu: CPU to pin the sampling thread to
+            gpu_ids: Monitor several GPUs from one thread and one NVML
+                session; the recorded power is the sum across them
+            use_hw_samples: Drain the driver's internal power-sample buffer
+                (nvmlDeviceGetSamples) each wakeup instead of taking one
+                instantaneous reading, capturing power at the hardware
+                sampling rate while waking far less often
+            **kwargs: Ring and spool options forwarded to BasePowerMonitor
+                (max_samples, spool_path, coalesce, ...)
+
         Raises:
             ImportError: If pynvml is not available
             RuntimeError: If no NVIDIA GPU is found
         """
-        super().__init__(sampling_interval, device_index)
-        
+        super().__init__(sampling_interval, device_index, monitor_cpu, **kwargs)
+
         if not NVML_AVAILABLE:
             raise ImportError("pynvml not installed. Install it with: pip install nvidia-ml-py3")
-        
+
+        _nvml_acquire()
+        self._nvml_acquired = True
         try:
-            pynvml.nvmlInit()
             self.device_count = pynvml.nvmlDeviceGetCount()
-            if device_index >= self.device_count:
-                raise RuntimeError(f"GPU index {device_index} out of range. Found {self.device_count} GPUs.")
-            
-            self.device = pynvml.nvmlDeviceGetHandleByIndex(device_index)
+            self.gpu_ids = list(gpu_ids) if gpu_ids is not None else [device_index]
+            for idx in self.gpu_ids:
+                if idx >= self.device_count:
+                    raise RuntimeError(f"GPU index {idx} out of range. Found {self.device_count} GPUs.")
+
+            # Handles are resolved once; one monitor thread samples them all
+            # instead of spawning a thread (and NVML session) per GPU.
+            self.devices = [pynvml.nvmlDeviceGetHandleByIndex(idx) for idx in self.gpu_ids]
+            self.device = self.devices[0]
             device_name_bytes = pynvml.nvmlDeviceGetName(self.device)
             self.device_name = device_name_bytes.decode() if isinstance(device_name_bytes, bytes) else device_name_bytes
+            self._static_metadata = self._build_static_metadata()
+            self._power_field_ids = self._probe_field_values()
+            self._last_total_energy_mj: Optional[float] = None
+            self.use_hw_samples = use_hw_samples and hasattr(pynvml, 'nvmlDeviceGetSamples')
+            self._last_hw_sample_us = 0
             self.logger.info(f"Monitoring NVIDIA GPU: {self.device_name}")
-            
+
         except pynvml.NVMLError as e:
+            self._release_nvml()
             raise RuntimeError(f"Failed to initialize NVIDIA GPU monitoring: {e}")
 
-    def _read_power(self) -> Optional[float]:
-        """Read current GPU power using NVML."""
-        try:
-            power = pynvml.nvmlDeviceGetPowerUsage(self.device) / 1000.0  # Convert to watts
-            return power
-        except pynvml.NVMLError as e:
-            self.logger.error(f"Error reading GPU power: {e}")
-            return None
+    def _release_nvml(self) -> None:
+        """Give back this monitor's NVML reference (idempotent)."""
+        if getattr(self, '_nvml_acquired', False):
+            self._nvml_acquired = False
+            _nvml_release()
 
-    def _get_metadata(self) -> Dict[str, Any]:
-        """Get metadata about the current reading"""
+    def _build_static_metadata(self) -> Dict[str, Any]:
+        """Fetch device facts that never change during a run.
+
+        Queried once at init so per-sample metadata collection only has to
+        touch the dynamic counters.
+        """
         metadata = {
             'monitor_type': 'nvidia_gpu',
             'sampling_interval': self.sampling_interval,
             'device_index': self.device_index,
+            'gpu_ids': self.gpu_ids,
             'device_name': self.device_name
         }
-        
-        # Add GPU-specific metadata
+        try:
+            memory = pynvml.nvmlDeviceGetMemoryInfo(self.device)
+            metadata['memory_total'] = memory.total
+        except pynvml.NVMLError as e:
+            self.logger.warning(f"Error getting static GPU metadata: {e}")
+        if len(self.devices) > 1:
+            # Per-card probes are independent driver round-trips; fan them
+            # out so init latency is the slowest card, not the sum over cards
+            with ThreadPoolExecutor(max_workers=min(len(self.devices), 8)) as pool:
+                metadata['gpu_info'] = list(pool.map(self._device_info, self.devices))
+        return metadata
+
+    def _device_info(self, device) -> Dict[str, Any]:
+        """Static facts for one device (used by the parallel init probe)."""
+        info: Dict[str, Any] = {}
+        try:
+            name = pynvml.nvmlDeviceGetName(device)
+            info['name'] = name.decode() if isinstance(name, bytes) else name
+            info['memory_total'] = pynvml.nvmlDeviceGetMemoryInfo(device).total
+        except pynvml.NVMLError as e:
+            self.logger.warning(f"Error probing GPU metadata: {e}")
+        return info
+
+    def _probe_field_values(self) -> Optional[List[int]]:
+        """Check whether the driver supports batched field-value power reads.
+
+        nvmlDeviceGetFieldValues fetches several metrics in one driver IPC,
+        halving the per-sample round-trips compared with one call per metric.
+        Older drivers/bindings lack the power field ids, so probe once at
+        init and fall back to the per-metric API when unsupported.
+        """
+        if not hasattr(pynvml, 'nvmlDeviceGetFieldValues'):
+            return None
+        field_ids = [
+            fid for name in ('NVML_FI_DEV_POWER_INSTANT',
+                             'NVML_FI_DEV_TOTAL_ENERGY_CONSUMPTION')
+            if (fid := getattr(pynvml, name, None)) is not None
+        ]
+        if not field_ids:
+            return None
+        try:
+            values = pynvml.nvmlDeviceGetFieldValues(self.device, field_ids)
+            if values[0].nvmlReturn != pynvml.NVML_SUCCESS:
+                return None
+        except pynvml.NVMLError:
+            return None
+        return field_ids
+
+    @staticmethod
+    def _field_value(value) -> float:
+        """Extract the numeric payload from an NVML field-value union."""
+        if value.valueType == pynvml.NVML_VALUE_TYPE_DOUBLE:
+            return value.value.dVal
+        if value.valueType == pynvml.NVML_VALUE_TYPE_UNSIGNED_INT:
+            return value.value.uiVal
+        if value.valueType == pynvml.NVML_VALUE_TYPE_SIGNED_INT:
+            return value.value.siVal
+        return value.value.ullVal
+
+    def _drain_hw_samples(self) -> int:
+        """Drain the driver's buffered power samples into the ring.
+
+        One nvmlDeviceGetSamples call returns every sample the driver has
+        recorded (at its own ~50 ms cadence) since the last drain, so the
+        monitor thread can wake once a second and still capture transient
+        power at hardware resolution. Returns the number of samples stored.
+        """
+        try:
+            _, samples = pynvml.nvmlDeviceGetSamples(
+                self.device, pynvml.NVML_TOTAL_POWER_SAMPLES, self._last_hw_sample_us)
+        except pynvml.NVMLError as e:
+            # NOT_FOUND just means no new samples since the last drain
+            if getattr(e, 'value', None) != getattr(pynvml, 'NVML_ERROR_NOT_FOUND', None):
+                self.logger.error("Error draining GPU power samples: %s", e)
+            return 0
+        push = self._ring.push
+        for sample in samples:
+            self._last_hw_sample_us = sample.timeStamp
+            # NVML timestamps are epoch microseconds; values are milliwatts
+            push(sample.timeStamp * 1000, sample.sampleValue.uiVal / 1000.0)
+        return len(samples)
+
+    def _collect_readings(self) -> None:
+        """Collect GPU power readings, draining hardware samples if enabled."""
+        if not self.use_hw_samples:
+            return super()._collect_readings()
+        self._pin_monitor_thread()
+        drain = self._drain_hw_samples
+        wait = self._stop_event.wait
+        while not wait(self.sampling_interval):
+            try:
+                drain()
+            except Exception as e:
+                self.logger.error("Error collecting GPU reading: %s", e)
+        drain()
+
+    def _read_power(self) -> Optional[float]:
+        """Read current GPU power using NVML.
+
+        With several gpu_ids this sums the instantaneous power across all
+        monitored devices, still from a single thread and NVML session.
+        """
+        try:
+            if len(self.devices) > 1:
+                return sum(pynvml.nvmlDeviceGetPowerUsage(device)
+                           for device in self.devices) / 1000.0
+            if self._power_field_ids:
+                # One batched IPC for instantaneous power (mW) and, when the
+                # driver provides it, cumulative energy (mJ) for metadata.
+                values = pynvml.nvmlDeviceGetFieldValues(self.device, self._power_field_ids)
+                power = None
+                for field_id, value in zip(self._power_field_ids, values):
+                    if value.nvmlReturn != pynvml.NVML_SUCCESS:
+                        continue
+                    if field_id == getattr(pynvml, 'NVML_FI_DEV_POWER_INSTANT', None):
+                        power = self._field_value(value) / 1000.0
+                    else:
+                        self._last_total_energy_mj = self._field_value(value)
+                if power is not None:
+                    return power
+            return pynvml.nvmlDeviceGetPowerUsage(self.device) / 1000.0  # Convert to watts
+        except pynvml.NVMLError as e:
+            self.logger.error("Error reading GPU power: %s", e)
+            return None
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        """Get metadata about the current reading"""
+        metadata = dict(self._static_metadata)
+        if self._last_total_energy_mj is not None:
+            metadata['total_energy_mj'] = self._last_total_energy_mj
+
+        # Add the dynamic counters; static facts come from the cached template
         try:
             # Get utilization rates
             util = pynvml.nvmlDeviceGetUtilizationRates(self.device)
             metadata['gpu_util'] = util.gpu
             metadata['memory_util'] = util.memory
-            
+
             # Get memory info
             memory = pynvml.nvmlDeviceGetMemoryInfo(self.device)
             metadata['memory_used'] = memory.used
-            metadata['memory_total'] = memory.total
-            
+
             # Get temperature
             metadata['temperature'] = pynvml.nvmlDeviceGetTemperature(
                 self.device, pynvml.NVML_TEMPERATURE_GPU)
-            
+
             # Get clock info
             metadata['sm_clock'] = pynvml.nvmlDeviceGetClockInfo(
                 self.device, pynvml.NVML_CLOCK_SM)
             metadata['mem_clock'] = pynvml.nvmlDeviceGetClockInfo(
                 self.device, pynvml.NVML_CLOCK_MEM)
-            
+
         except pynvml.NVMLError as e:
-            self.logger.error(f"Error getting GPU metadata: {e}")
-            
+            self.logger.error("Error getting GPU metadata: %s", e)
+
         return metadata
     
     def __del__(self):
-        """Cleanup NVML on object destruction."""
+        """Release this monitor's NVML reference on destruction."""
         try:
-            pynvml.nvmlShutdown()
-        except:
+            self._release_nvml()
+        except Exception:
             pass
 
 class AMDGPUMonitor(GPUMonitor):
     """Monitor AMD GPU power consumption using AMD's monitoring interface."""
     
-    def __init__(self, sampling_interval: float = 1.0, device_index: int = 0):
+    def __init__(self, sampling_interval: float = 1.0, device_index: int = 0,
+                 monitor_cpu: Optional[int] = None, **kwargs):
         """Initialize the AMD GPU monitor.
-        
+
         Args:
             sampling_interval: Time between readings in seconds
             device_index: Index of the GPU to monitor
-        
+            monitor_cpu: CPU to pin the sampling thread to
+            **kwargs: Ring and spool options forwarded to BasePowerMonitor
+                (max_samples, spool_path, coalesce, ...)
+
         Raises:
             RuntimeError: If no AMD GPU is found or if monitoring interface is not available
         """
-        super().__init__(sampling_interval, device_index)
+        super().__init__(sampling_interval, device_index, monitor_cpu, **kwargs)
         
         # Check for AMD GPU monitoring interface
         self.amd_path = self._find_amd_gpu_path()
         if not self.amd_path:
             raise RuntimeError("AMD GPU monitoring interface not found. Ensure your GPU supports AMD power monitoring.")
-        
+
+        # Resolve the hwmon attribute paths once; the sampling and metadata
+        # paths then never stat the filesystem again.
+        self.power_path = os.path.join(self.amd_path, 'power1_input')
+        # Keep power1_input open so each sample is one pread instead of
+        # open/read/close (three syscalls and a path lookup per tick).
+        try:
+            self._power_fd: Optional[int] = os.open(self.power_path, os.O_RDONLY)
+        except OSError as e:
+            self.logger.warning(f"Could not open {self.power_path}: {e}")
+            self._power_fd = None
+        temp_path = os.path.join(self.amd_path, 'temp1_input')
+        self.temp_path = temp_path if os.path.exists(temp_path) else None
+        fan_path = os.path.join(self.amd_path, 'fan1_input')
+        self.fan_path = fan_path if os.path.exists(fan_path) else None
+
+        # Static metadata template, built once; per-sample collection only
+        # reads the dynamic sensors into a copy
+        self._static_metadata: Dict[str, Any] = {
+            'monitor_type': 'amd_gpu',
+            'sampling_interval': self.sampling_interval,
+            'device_index': self.device_index
+        }
+        try:
+            with open(os.path.join(self.amd_path, 'name'), 'r') as f:
+                self._static_metadata['device_name'] = f.read().strip()
+        except (IOError, ValueError) as e:
+            self.logger.warning(f"Error reading AMD GPU name: {e}")
+
         self.logger.info(f"Monitoring AMD GPU at index {device_index}")
     
     def _find_amd_gpu_path(self) -> Optional[str]:
-        """Find the path to AMD GPU monitoring interface."""
-        # Common paths for AMD GPU monitoring
-        possible_paths = [
-            '/sys/class/hwmon/hwmon0',  # Common path for AMD GPUs
-            '/sys/class/hwmon/hwmon1',
-            '/sys/class/hwmon/hwmon2'
-        ]
-        
-        for path in possible_paths:
-            if os.path.exists(path):
-                try:
-                    # Check if this is an AMD GPU
-                    with open(os.path.join(path, 'name'), 'r') as f:
-                        if 'amdgpu' in f.read().lower():
-                            return path
-                except (IOError, ValueError):
-                    continue
-        
+        """Find the path to AMD GPU monitoring interface.
+
+        Prefer resolving /sys/class/drm/card<N>/device/hwmon/, which ties
+        the hwmon instance to this monitor's DRM card index; hwmon numbering
+        under /sys/class/hwmon depends on module load order, so hardcoded
+        indices pick the wrong (or no) device. Falls back to scanning the
+        hwmon class for an amdgpu entry.
+        """
+        drm_hwmon = f"/sys/class/drm/card{self.device_index}/device/hwmon"
+        try:
+            # scandir enumerates in one getdents64 pass without the list
+            # of stat'ed names os.listdir + os.path.join would build
+            with os.scandir(drm_hwmon) as entries:
+                names = sorted(e.name for e in entries
+                               if e.name.startswith('hwmon'))
+            if names:
+                return os.path.join(drm_hwmon, names[0])
+        except OSError:
+            pass
+
+        try:
+            with os.scandir('/sys/class/hwmon') as entries:
+                paths = sorted(e.path for e in entries)
+        except OSError:
+            return None
+        for path in paths:
+            try:
+                # Check if this is an AMD GPU
+                with open(os.path.join(path, 'name'), 'r') as f:
+                    if 'amdgpu' in f.read().lower():
+                        return path
+            except (IOError, ValueError):
+                continue
+
         return None
+
+    @staticmethod
+    def _get_available_gpus() -> List[int]:
+        """List DRM card indices that expose an amdgpu hwmon interface.
+
+        One scandir pass over /sys/class/drm plus a directory check per
+        card; no per-entry open() until a monitor is actually built.
+        """
+        gpus = []
+        try:
+            with os.scandir('/sys/class/drm') as entries:
+                for entry in entries:
+                    name = entry.name
+                    if (name.startswith('card') and name[4:].isdigit()
+                            and os.path.isdir(os.path.join(entry.path,
+                                                           'device', 'hwmon'))):
+                        gpus.append(int(name[4:]))
+        except OSError:
+            return []
+        return sorted(gpus)
     
     def _read_power(self) -> Optional[float]:
         """Read current GPU power using AMD's monitoring interface."""
         try:
             # Read power from AMD GPU
-            power_path = os.path.join(self.amd_path, 'power1_input')
-            with open(power_path, 'r') as f:
-                power = int(f.read().strip())
+            if self._power_fd is not None:
+                power = int(os.pread(self._power_fd, 32, 0))
+            else:
+                with open(self.power_path, 'r') as f:
+                    power = int(f.read().strip())
             return power / 1e6  # Convert microwatts to watts
-        except (IOError, ValueError) as e:
-            self.logger.error(f"Error reading AMD GPU power: {e}")
+        except (OSError, ValueError) as e:
+            self.logger.error("Error reading AMD GPU power: %s", e)
             return None
-    
+
+    def __del__(self):
+        """Close the persistent hwmon file descriptor."""
+        try:
+            if self._power_fd is not None:
+                os.close(self._power_fd)
+        except (AttributeError, OSError):
+            pass
+
     def _get_metadata(self) -> Dict[str, Any]:
         """Get metadata about the current reading"""
-        metadata = {
-            'monitor_type': 'amd_gpu',
-            'sampling_interval': self.sampling_interval,
-            'device_index': self.device_index
-        }
-        
+        metadata = dict(self._static_metadata)
+
         # Add GPU-specific metadata
         try:
-            # Get GPU name
-            with open(os.path.join(self.amd_path, 'name'), 'r') as f:
-                metadata['device_name'] = f.read().strip()
-            
-            # Get temperature if available
-            temp_path = os.path.join(self.amd_path, 'temp1_input')
-            if os.path.exists(temp_path):
-                with open(temp_path, 'r') as f:
+            # Temperature and fan sensors were resolved at init; absent
+            # attributes cost nothing here
+            if self.temp_path:
+                with open(self.temp_path, 'r') as f:
                     metadata['temperature'] = int(f.read().strip()) / 1000.0  # Convert millidegree to degree
-            
-            # Get fan speed if available
-            fan_path = os.path.join(self.amd_path, 'fan1_input')
-            if os.path.exists(fan_path):
-                with open(fan_path, 'r') as f:
+
+            if self.fan_path:
+                with open(self.fan_path, 'r') as f:
                     metadata['fan_speed'] = int(f.read().strip())
-            
+
         except (IOError, ValueError) as e:
-            self.logger.error(f"Error getting AMD GPU metadata: {e}")
-            
+            self.logger.error("Error getting AMD GPU metadata: %s", e)
+
         return metadata 
\ No newline at end of file
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+
+import heapq
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+from .base import BasePowerMonitor
+
+
+def build_monitors(factories: List[Callable[[], BasePowerMonitor]],
+                   max_workers: int = 8) -> List[BasePowerMonitor]:
+    """Construct several monitors in parallel.
+
+    Monitor construction can block on I/O — a BMC session handshake, an
+    NVML init, sysfs probes — so building one monitor per node or device
+    sequentially costs the sum of those latencies. Fanning the factories
+    out over a thread pool makes cluster-wide setup cost roughly the
+    slowest single construction instead.
+
+    Args:
+        factories: Zero-argument callables each returning a monitor, e.g.
+            ``lambda: RedfishMonitor(host=h)`` per node
+        max_workers: Upper bound on concurrent constructions
+
+    Returns:
+        The constructed monitors, in the order of their factories. A
+        factory that raises propagates its exception.
+    """
+    if not factories:
+        return []
+    with ThreadPoolExecutor(max_workers=min(len(factories), max_workers)) as pool:
+        return list(pool.map(lambda factory: factory(), factories))
+
+
+class MonitorReactor:
+    """Drive several monitors' sampling from a single reactor thread.
+
+    One thread per monitor means N wakeup streams competing for the same
+    housekeeping CPU. The reactor keeps registered monitors on a deadline
+    min-heap and samples whichever is due next, so any number of monitors
+    costs one thread, one timer and one core. Monitors keep their own
+    rings, intervals and drained readings; only the scheduling is shared.
+    """
+
+    def __init__(self, monitor_cpu: Optional[int] = None):
+        """Initialize the reactor.
+
+        Args:
+            monitor_cpu: CPU to pin the reactor thread to (default: last
+                online CPU, as with the per-monitor threads)
+        """
+        self.monitor_cpu = monitor_cpu
+        self.monitors: List[BasePowerMonitor] = []
+        self.logger = logging.getLogger(__name__)
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def add_monitor(self, monitor: BasePowerMonitor) -> None:
+        """Register a monitor to be sampled by the reactor."""
+        if self._thread and self._thread.is_alive():
+            raise RuntimeError("Cannot add monitors while the reactor is running")
+        self.monitors.append(monitor)
+
+    def _pin_thread(self) -> None:
+        """Pin the reactor thread to a housekeeping CPU at low priority."""
+        if not hasattr(os, 'sched_setaffinity'):
+            return
+        try:
+            cpu = self.monitor_cpu
+            if cpu is None:
+                cpu = max(os.sched_getaffinity(0))
+            os.sched_setaffinity(0, {cpu})
+            os.nice(19)
+        except OSError as e:
+            self.logger.warning(f"Could not pin reactor thread: {e}")
+
+    def _run(self) -> None:
+        """Reactor loop: sample whichever monitor's deadline is due next."""
+        self._pin_thread()
+        monotonic = time.monotonic
+        wait = self._stop_event.wait
+        now = monotonic()
+        heap = [(now, index, monitor) for index, monitor in enumerate(self.monitors)]
+        heapq.heapify(heap)
+        while heap:
+            deadline, index, monitor = heap[0]
+            delay = deadline - monotonic()
+            if delay > 0 and wait(delay):
+                return
+            try:
+                monitor._sample_once()
+            except Exception as e:
+                self.logger.error("Error sampling %s: %s", monitor.__class__.__name__, e)
+            next_deadline = deadline + monitor.sampling_interval
+            if next_deadline <= monotonic():
+                # Fell behind; resynchronize this monitor instead of bursting
+                next_deadline = monotonic() + monitor.sampling_interval
+            heapq.heapreplace(heap, (next_deadline, index, monitor))
+
+    def start(self) -> None:
+        """Start sampling all registered monitors."""
+        if self._thread and self._thread.is_alive():
+            self.logger.warning("Reactor already running")
+            return
+        if not self.monitors:
+            raise RuntimeError("No monitors registered with the reactor")
+        self._stop_event.clear()
+        self._thread = threading.Thread(target=self._run)
+        self._thread.daemon = True
+        self._thread.start()
+        self.logger.info(f"Reactor started with {len(self.monitors)} monitors")
+
+    def stop(self) -> None:
+        """Stop sampling and drain every monitor's staged readings."""
+        if self._thread and self._thread.is_alive():
+            self._stop_event.set()
+            self._thread.join()
+            self.logger.info("Reactor stopped")
+        for monitor in self.monitors:
+            monitor._drain_ring()
+
+    def is_running(self) -> bool:
+        """Check if the reactor thread is alive."""
+        return bool(self._thread and self._thread.is_alive())
@@ -1,15 +1,18 @@
 #!/usr/bin/env python3
 
+import atexit
+import functools
 import os
+import re
+import selectors
+import shutil
+import subprocess
 import time
 import threading
+import types
 import logging
-import subprocess
-import json
-import requests
 from typing import Optional, Dict, Any, List
-from datetime import datetime
-from .base import BasePowerMonitor, PowerReading
+from .base import BasePowerMonitor, PowerReading, sample_timestamp_ns
 
 # Try to import IPMI libraries
 try:
@@ -19,74 +22,170 @@ try:
 except ImportError:
     IPMI_AVAILABLE = False
 
+# orjson parses the Redfish JSON bodies several times faster than the
+# stdlib; fall back silently when it is not installed.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
 # Redfish-based in-band monitoring is not supported in this project.
 
+@functools.lru_cache(maxsize=1)
+def _system_info_cached() -> Dict[str, Any]:
+    """Parse hostname and /etc/os-release once per process.
+
+    The result never changes at runtime, so instantiating several monitors
+    (IPMI + Redfish + node stats) should not reopen and reparse the file.
+    """
+    info = {}
+    try:
+        info['hostname'] = os.uname().nodename
+
+        with open('/etc/os-release', 'r') as f:
+            for line in f:
+                if '=' in line:
+                    key, value = line.split('=', 1)
+                    info[key.strip().lower()] = value.strip().strip('"')
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Error getting system info: {e}")
+
+    return info
+
+
 class SystemMonitor(BasePowerMonitor):
     """Base class for system power monitoring."""
-    
-    def __init__(self, sampling_interval: float = 1.0):
+
+    # Class-level so the metadata template picks up the right value without
+    # each subclass rewriting the key in __init__
+    MONITOR_TYPE = 'abstract_system'
+
+
+    def __init__(self, sampling_interval: float = 1.0, monitor_cpu: Optional[int] = None,
+                 poll_interval: Optional[float] = None, **kwargs):
         """Initialize the system monitor.
-        
+
         Args:
             sampling_interval: Time between readings in seconds
+            monitor_cpu: CPU to pin the sampling thread to
+            poll_interval: How often to actually query the sensor. BMC
+                power telemetry typically refreshes every 1-5 s, so
+                polling it at a fast sampling cadence burns BMC round
+                trips without new information; with a poll_interval the
+                recorded series keeps the sampling cadence but reuses the
+                last polled value between sensor refreshes. None polls on
+                every sample.
+            **kwargs: Ring and spool options forwarded to BasePowerMonitor
+                (max_samples, spool_path, coalesce, ...)
         """
-        super().__init__(sampling_interval)
+        super().__init__(sampling_interval, monitor_cpu, **kwargs)
+        self.poll_interval = poll_interval
+        self._last_poll_value: Optional[float] = None
+        self._next_poll = 0.0
         self.logger = logging.getLogger(__name__)
         self._stop_event = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self.system_info = self._get_system_info()
+        # System metadata is identical for every sample; build the dict once
+        # and hand the same object to each reading instead of reallocating
+        # it per sample. The read-only proxy makes accidental mutation of
+        # the shared template (visible in every recorded sample) a TypeError
+        # instead of silent data corruption. Subclasses extend the template
+        # in their __init__ and re-freeze it.
+        self._static_metadata: Dict[str, Any] = types.MappingProxyType({
+            'monitor_type': self.MONITOR_TYPE,
+            'sampling_interval': self.sampling_interval,
+            'system_info': self.system_info
+        })
 
     def _read_power(self) -> Optional[float]:
         """Read current system power (to be implemented by subclasses)."""
         raise NotImplementedError("SystemMonitor is abstract. Use a concrete subclass like IPMIMonitor.")
 
     def _get_system_info(self) -> Dict[str, Any]:
-        """Get basic system information."""
-        info = {}
-        try:
-            # Get hostname
-            info['hostname'] = os.uname().nodename
-            
-            # Get OS information
-            with open('/etc/os-release', 'r') as f:
-                for line in f:
-                    if '=' in line:
-                        key, value = line.split('=', 1)
-                        info[key.strip().lower()] = value.strip().strip('"')
-        except Exception as e:
-            self.logger.warning(f"Error getting system info: {e}")
-        
-        return info
+        """Get basic system information (cached process-wide)."""
+        return dict(_system_info_cached())
 
     def _get_metadata(self) -> Dict[str, Any]:
-        """Get metadata about the current reading."""
-        return {
-            'monitor_type': 'abstract_system',
-            'sampling_interval': self.sampling_interval,
-            'system_info': self.system_info
-        }
-    
+        """Get metadata about the current reading (cached template)."""
+        return self._static_metadata
+
+    def _sample_power(self) -> Optional[float]:
+        """Return the power for this tick, querying the sensor only when due.
+
+        With no poll_interval this is just _read_power; otherwise the
+        sensor is polled at its own (slower) cadence and intervening
+        samples reuse the last polled value.
+        """
+        if self.poll_interval is None:
+            return self._read_power()
+        now = time.monotonic()
+        if self._last_poll_value is None or now >= self._next_poll:
+            self._last_poll_value = self._read_power()
+            self._next_poll = now + self.poll_interval
+        return self._last_poll_value
+
+    def _sample_once(self) -> None:
+        """Take one sample synchronously, honouring poll_interval.
+
+        Routed through _sample_power so monitors driven by MonitorReactor
+        get the same sensor-poll throttling as the per-monitor thread.
+        """
+        power = self._sample_power()
+        if power is None:
+            return
+        self._ring.push(sample_timestamp_ns(), power, self._get_metadata())
+
     def _collect_readings(self) -> None:
-        """Collect system power readings in a separate thread."""
-        while not self._stop_event.is_set():
+        """Collect system power readings in a separate thread.
+
+        Scheduled against monotonic deadlines so read latency does not
+        accumulate as sampling drift.
+        """
+        self._pin_monitor_thread()
+        # Bind hot-loop lookups to locals (LOAD_FAST instead of LOAD_ATTR)
+        read_power = self._sample_power
+        push = self._ring.push
+        stopping = self._stop_event.is_set
+        wait = self._stop_event.wait
+        get_metadata = self._get_metadata
+        monotonic = time.monotonic
+        time_ns = sample_timestamp_ns
+        backoff = self._backoff_interval
+        interval = self.sampling_interval
+        fail_streak = 0
+        next_deadline = monotonic() + interval
+        while not stopping():
             try:
-                power = self._read_power()
-                
-                reading = PowerReading(
-                    timestamp=datetime.now(),
-                    power_watts=power,
-                    metadata=self._get_metadata()
-                )
-                self.readings.append(reading)
-                
+                power = read_power()
+                if power is None:
+                    # The ring's float64 array would coerce None to NaN;
+                    # record nothing and count it toward the streak
+                    fail_streak += 1
+                else:
+                    push(time_ns(), power, get_metadata())
+                    fail_streak = 0
+
             except Exception as e:
-                self.logger.error(f"Error collecting system reading: {e}")
-                
-            time.sleep(self.sampling_interval)
+                fail_streak += 1
+                self.logger.error("Error collecting system reading: %s", e)
+
+            # Exponentially back off while the source is failing so a dead
+            # sensor is not hammered at the full sampling rate
+            step = backoff(interval, fail_streak)
+            delay = next_deadline - monotonic()
+            if delay > 0:
+                if wait(delay):
+                    return
+                next_deadline += step
+            else:
+                next_deadline = monotonic() + step
 
     def start(self) -> None:
         """Start collecting system power readings."""
         if not self._thread or not self._thread.is_alive():
+            self._reopen_spool()
             self._stop_event.clear()
             self._thread = threading.Thread(target=self._collect_readings)
             self._thread.daemon = True
@@ -105,23 +204,32 @@ class SystemMonitor(BasePowerMonitor):
             self._stop_event.set()
             self._thread.join()
             self.logger.info("System monitoring stopped")
-            
-        return self.readings
+
+        readings = self._drain_ring()
+        self.close()
+        return readings
 
 class IPMIMonitor(SystemMonitor):
     """Monitor system power using IPMI."""
-    
-    def __init__(self, sampling_interval: float = 1.0, host: str = None, 
-                 username: str = None, password: str = None):
+
+    MONITOR_TYPE = 'ipmi'
+
+
+    def __init__(self, sampling_interval: float = 1.0, host: str = None,
+                 username: str = None, password: str = None,
+                 monitor_cpu: Optional[int] = None, **kwargs):
         """Initialize the IPMI monitor.
-        
+
         Args:
             sampling_interval: Time between readings in seconds
             host: IPMI host (default: localhost)
             username: IPMI username
             password: IPMI password
+            monitor_cpu: CPU to pin the sampling thread to
+            **kwargs: Forwarded to SystemMonitor (poll_interval, max_samples,
+                spool_path, coalesce, ...)
         """
-        super().__init__(sampling_interval)
+        super().__init__(sampling_interval, monitor_cpu, **kwargs)
         
         if not IPMI_AVAILABLE:
             raise ImportError("pyipmi not installed. Install it with: pip install pyipmi")
@@ -144,10 +252,13 @@ class IPMIMonitor(SystemMonitor):
             self.ipmi.session.establish()
             
             self.logger.info(f"Connected to IPMI on {self.host}")
-            
+
         except Exception as e:
             raise RuntimeError(f"Failed to initialize IPMI: {e}")
-    
+
+        self._static_metadata = types.MappingProxyType(
+            dict(self._static_metadata, ipmi_host=self.host))
+
     def _read_power(self) -> Optional[float]:
         """Read system power using IPMI."""
         try:
@@ -159,24 +270,24 @@ class IPMIMonitor(SystemMonitor):
                 return power
             return None
         except Exception as e:
-            self.logger.error(f"Error reading IPMI power: {e}")
+            self.logger.error("Error reading IPMI power: %s", e)
             return None
     
     def _get_metadata(self) -> Dict[str, Any]:
         """Get metadata about the current reading."""
-        metadata = super()._get_metadata()
-        metadata['monitor_type'] = 'ipmi'
-        metadata['ipmi_host'] = self.host
-        
-        # Add IPMI-specific metadata
+        metadata = self._static_metadata
+
+        # Add IPMI-specific metadata; only copy the template when there is a
+        # dynamic field to record
         try:
             # Get sensor readings
             sensors = self.ipmi.sensor_get_sensor_reading(0x30)  # Power sensor
             if sensors:
+                metadata = dict(metadata)
                 metadata['power_sensor'] = sensors
         except Exception as e:
-            self.logger.error(f"Error getting IPMI metadata: {e}")
-        
+            self.logger.error("Error getting IPMI metadata: %s", e)
+
         return metadata
     
     def __del__(self):
@@ -187,5 +298,374 @@ class IPMIMonitor(SystemMonitor):
         except:
             pass
 
-# Redfish and iDRAC in-band monitors have been removed. Use out-of-band iDRAC via
-# power_profiling.outofband.IDRACRemoteClient instead.
\ No newline at end of file
+@functools.lru_cache(maxsize=1)
+def _ipmitool_path() -> Optional[str]:
+    """Locate the ipmitool binary once per process."""
+    return shutil.which('ipmitool')
+
+
+# Compiled once at import: `ipmitool dcmi power reading` emits a dozen
+# lines per call, and a single precompiled scan beats splitting each
+# line in Python on every sample.
+_IPMITOOL_POWER_RE = re.compile(
+    r'Instantaneous power reading:\s*([\d.]+)\s*Watts')
+
+
+class _IpmiShell:
+    """One long-lived `ipmitool shell` subprocess.
+
+    Each command becomes a line on stdin instead of a fork+exec plus BMC
+    session setup, so several monitors sampling the same BMC share a
+    single authenticated session. Commands are serialized with a lock;
+    output is read up to the next prompt, bounded by a timeout so a hung
+    BMC cannot wedge the sampling thread forever.
+    """
+
+    _PROMPT = b'ipmitool> '
+
+    def __init__(self, argv: List[str], timeout: float = 10.0):
+        self._proc = subprocess.Popen(argv, stdin=subprocess.PIPE,
+                                      stdout=subprocess.PIPE,
+                                      stderr=subprocess.STDOUT)
+        self._lock = threading.Lock()
+        # Swallow the banner and first prompt
+        self._read_until_prompt(timeout)
+
+    def alive(self) -> bool:
+        """Whether the shell subprocess is still running."""
+        return self._proc.poll() is None
+
+    def _read_until_prompt(self, timeout: Optional[float]) -> bytes:
+        """Read stdout up to the next prompt, bounded by the timeout.
+
+        Raises:
+            subprocess.TimeoutExpired: No prompt arrived in time; the
+                stream is mid-message, so the shell must be discarded.
+            OSError: The shell closed its output (process died).
+        """
+        stdout = self._proc.stdout
+        deadline = time.monotonic() + timeout if timeout is not None else None
+        buf = bytearray()
+        with selectors.DefaultSelector() as selector:
+            selector.register(stdout, selectors.EVENT_READ)
+            while True:
+                if deadline is not None:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0 or not selector.select(remaining):
+                        raise subprocess.TimeoutExpired(self._proc.args, timeout)
+                chunk = os.read(stdout.fileno(), 4096)
+                if not chunk:
+                    raise OSError("ipmitool shell closed its output")
+                buf += chunk
+                if buf.endswith(self._PROMPT):
+                    return bytes(buf[:-len(self._PROMPT)])
+
+    def command(self, line: str, timeout: Optional[float] = None) -> str:
+        """Run one shell command and return its decoded output.
+
+        On timeout or shell death the subprocess is closed, so the pool
+        hands out a fresh shell on the next lookup; the error propagates
+        to the caller's read-failure handling.
+        """
+        with self._lock:
+            try:
+                self._proc.stdin.write(line.encode('ascii') + b'\n')
+                self._proc.stdin.flush()
+                output = self._read_until_prompt(timeout)
+            except (OSError, ValueError, subprocess.SubprocessError):
+                self.close()
+                raise
+            return output.decode('ascii', 'replace')
+
+    def close(self) -> None:
+        try:
+            self._proc.stdin.close()
+            self._proc.terminate()
+        except (OSError, ValueError):
+            pass
+
+
+# Shells are pooled per BMC (argv) like Redfish sessions: all monitors
+# polling the same BMC ride one subprocess and one IPMI session.
+_ipmi_shell_pool: Dict[tuple, _IpmiShell] = {}
+_ipmi_shell_lock = threading.Lock()
+
+
+def _get_ipmi_shell(argv: List[str]) -> _IpmiShell:
+    """Return the pooled shell for an argv, creating it on first use.
+
+    A shell whose subprocess has exited (BMC dropped the session, or it
+    was killed after a command timeout) is evicted and replaced instead
+    of being handed out dead forever.
+    """
+    key = tuple(argv)
+    with _ipmi_shell_lock:
+        shell = _ipmi_shell_pool.get(key)
+        if shell is not None and not shell.alive():
+            shell.close()
+            shell = None
+        if shell is None:
+            shell = _IpmiShell(argv)
+            _ipmi_shell_pool[key] = shell
+        return shell
+
+
+def _close_ipmi_shells() -> None:
+    """Close every pooled shell; registered to run at interpreter exit."""
+    with _ipmi_shell_lock:
+        for shell in _ipmi_shell_pool.values():
+            shell.close()
+        _ipmi_shell_pool.clear()
+
+
+atexit.register(_close_ipmi_shells)
+
+
+class IpmitoolMonitor(SystemMonitor):
+    """Monitor system power via the ipmitool CLI (DCMI power readings).
+
+    Fallback for hosts where pyipmi is not installed but ipmitool is.
+    Works against the local BMC by default, or a remote one over lanplus
+    when a host is given.
+    """
+
+    MONITOR_TYPE = 'ipmitool'
+
+    def __init__(self, sampling_interval: float = 1.0, host: str = None,
+                 username: str = None, password: str = None,
+                 monitor_cpu: Optional[int] = None, use_shell: bool = False,
+                 poll_interval: Optional[float] = None, **kwargs):
+        """Initialize the ipmitool monitor.
+
+        Args:
+            sampling_interval: Time between readings in seconds
+            host: BMC hostname or IP; None reads the local BMC
+            username: IPMI username (remote only)
+            password: IPMI password (remote only)
+            monitor_cpu: CPU to pin the sampling thread to
+            use_shell: Keep one `ipmitool shell` subprocess (pooled per
+                BMC) and feed it commands on stdin, instead of a
+                fork+exec and session handshake per sample; shell reads
+                are bounded by the same timeout as the one-shot path
+            poll_interval: Query the BMC at this (slower) cadence while
+                recording at sampling_interval; see SystemMonitor
+            **kwargs: Ring and spool options forwarded to BasePowerMonitor
+                (max_samples, spool_path, coalesce, ...)
+        """
+        super().__init__(sampling_interval, monitor_cpu, poll_interval, **kwargs)
+
+        if _ipmitool_path() is None:
+            raise RuntimeError("ipmitool binary not found in PATH. "
+                               "Install it or use IPMIMonitor (pyipmi).")
+
+        self.host = host or os.environ.get('IPMI_HOST')
+        self.username = username or os.environ.get('IPMI_USERNAME')
+        self.password = password or os.environ.get('IPMI_PASSWORD')
+
+        # The argv is assembled once; _read_power only pays the exec
+        base_argv = [_ipmitool_path()]
+        if self.host:
+            base_argv += ['-I', 'lanplus', '-H', self.host]
+            if self.username:
+                base_argv += ['-U', self.username]
+            if self.password:
+                base_argv += ['-P', self.password]
+        self._command = base_argv + ['dcmi', 'power', 'reading']
+        # The shell itself is pooled per BMC and fetched per sample, so one
+        # that died or was killed after a timeout is replaced transparently
+        self._shell_argv = base_argv + ['shell'] if use_shell else None
+        # A slow BMC must not stall the sampler for several periods
+        self.request_timeout = max(self.sampling_interval, 2.0)
+
+        template = dict(self._static_metadata)
+        if self.host:
+            template['ipmi_host'] = self.host
+        self._static_metadata = types.MappingProxyType(template)
+
+        self.logger.info(f"Polling power via ipmitool on {self.host or 'localhost'}")
+
+    def _read_power(self) -> Optional[float]:
+        """Read system power from `ipmitool dcmi power reading`."""
+        try:
+            if self._shell_argv is not None:
+                shell = _get_ipmi_shell(self._shell_argv)
+                output = shell.command('dcmi power reading',
+                                       timeout=self.request_timeout)
+            else:
+                # ipmitool output is plain ASCII; skipping text=True avoids
+                # the universal-newlines UTF-8 decode wrapper and uses
+                # CPython's fast ASCII decode path instead
+                result = subprocess.run(self._command, capture_output=True,
+                                        timeout=self.request_timeout)
+                if result.returncode != 0:
+                    self.logger.error("ipmitool failed: %s",
+                                      result.stderr.decode('ascii', 'replace').strip())
+                    return None
+                output = result.stdout.decode('ascii', 'replace')
+            match = _IPMITOOL_POWER_RE.search(output)
+            if match is None:
+                self.logger.error("No power reading in ipmitool output")
+                return None
+            return float(match.group(1))
+        except (OSError, subprocess.SubprocessError, ValueError) as e:
+            self.logger.error("Error reading ipmitool power: %s", e)
+            return None
+
+
+# Redfish sessions are pooled per BMC so several monitors (e.g. power and
+# thermal views of one node) share a single TCP/TLS connection and auth
+# state instead of each opening their own.
+_redfish_session_pool: Dict[tuple, 'requests.Session'] = {}
+_redfish_session_lock = threading.Lock()
+
+
+def _get_redfish_session(host: str, username: Optional[str], password: Optional[str],
+                         verify_ssl: bool) -> 'requests.Session':
+    """Return the pooled session for a BMC, creating it on first use."""
+    # Imported here, not at module top: IPMI-only users should not pay the
+    # ~30 ms cold import of requests/urllib3
+    import requests
+    key = (host, username, verify_ssl)
+    with _redfish_session_lock:
+        session = _redfish_session_pool.get(key)
+        if session is None:
+            session = requests.Session()
+            session.auth = (username, password)
+            session.verify = verify_ssl
+            session.headers['Accept'] = 'application/json'
+            _redfish_session_pool[key] = session
+        return session
+
+
+class RedfishMonitor(SystemMonitor):
+    """Monitor system power via the BMC's Redfish API."""
+
+    MONITOR_TYPE = 'redfish'
+
+    def __init__(self, sampling_interval: float = 1.0, host: str = None,
+                 username: str = None, password: str = None,
+                 chassis_id: str = 'System.Embedded.1', verify_ssl: bool = False,
+                 monitor_cpu: Optional[int] = None, expand: bool = False,
+                 poll_interval: Optional[float] = None, **kwargs):
+        """Initialize the Redfish monitor.
+
+        Args:
+            sampling_interval: Time between readings in seconds
+            host: BMC/iDRAC hostname or IP
+            username: Redfish username
+            password: Redfish password
+            chassis_id: Redfish chassis identifier
+            verify_ssl: Verify the BMC's TLS certificate (BMCs commonly ship
+                self-signed certificates, hence the default)
+            monitor_cpu: CPU to pin the sampling thread to
+            expand: Ask the BMC to inline linked subresources with OData
+                $expand, so chassis that only reference per-PSU URIs from
+                the Power resource still answer in one round-trip. Off by
+                default since not every BMC implements $expand.
+            poll_interval: Query the BMC at this (slower) cadence while
+                recording at sampling_interval; see SystemMonitor
+            **kwargs: Ring and spool options forwarded to BasePowerMonitor
+                (max_samples, spool_path, coalesce, ...)
+        """
+        super().__init__(sampling_interval, monitor_cpu, poll_interval, **kwargs)
+
+        self.host = host or os.environ.get('REDFISH_HOST')
+        if not self.host:
+            raise ValueError("Redfish host must be given or set via REDFISH_HOST")
+        self.username = username or os.environ.get('REDFISH_USERNAME')
+        self.password = password or os.environ.get('REDFISH_PASSWORD')
+        self.chassis_id = chassis_id
+        self.verify_ssl = verify_ssl
+        self.power_url = f"https://{self.host}/redfish/v1/Chassis/{chassis_id}/Power"
+        if expand:
+            self.power_url += '?$expand=.($levels=1)'
+        # A slow BMC must not stall the sampler for several periods: cap the
+        # request timeout at one sampling interval (with a floor for fast
+        # cadences, since BMCs routinely take a few hundred ms to respond).
+        self.request_timeout = max(self.sampling_interval, 2.0)
+
+        # Persistent HTTPS session, pooled per BMC: the TCP and TLS
+        # handshakes are paid once per host rather than per monitor or
+        # per sample.
+        self.session = _get_redfish_session(self.host, self.username,
+                                            self.password, verify_ssl)
+        if not verify_ssl:
+            try:
+                import urllib3
+                urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            except ImportError:
+                pass
+
+        # ETag revalidation: when the BMC reports the Power resource
+        # unchanged (304), reuse the previous value without a body transfer.
+        self._last_etag: Optional[str] = None
+        self._last_power: Optional[float] = None
+        # The Power resource body already carries PowerSupplies, so the
+        # metadata path reuses the body fetched for the power reading
+        # instead of issuing a second GET.
+        self._last_body: Optional[Dict[str, Any]] = None
+
+        self._static_metadata = types.MappingProxyType(
+            dict(self._static_metadata, redfish_host=self.host,
+                 chassis_id=self.chassis_id))
+
+        self.logger.info(f"Polling Redfish power on {self.host} ({chassis_id})")
+
+    def _fetch_power_resource(self) -> Optional[Dict[str, Any]]:
+        """Fetch and parse the Power resource, revalidating with the ETag.
+
+        Sends If-None-Match with the last ETag; BMCs update their power
+        telemetry slower than we may poll, and a 304 costs neither a JSON
+        body on the wire nor a parse here. The parsed body is cached so
+        the metadata path can read PowerSupplies from the same response
+        instead of issuing its own GET.
+        """
+        headers = {'If-None-Match': self._last_etag} if self._last_etag else None
+        response = self.session.get(self.power_url, timeout=self.request_timeout,
+                                    headers=headers)
+        if response.status_code == 304:
+            return self._last_body
+        response.raise_for_status()
+        if ORJSON_AVAILABLE:
+            data = orjson.loads(response.content)
+        else:
+            data = response.json()
+        self._last_etag = response.headers.get('ETag')
+        self._last_body = data
+        return data
+
+    def _read_power(self) -> Optional[float]:
+        """Read system power from the Redfish Power resource."""
+        try:
+            data = self._fetch_power_resource()
+            if data is None:
+                return self._last_power
+            self._last_power = float(data['PowerControl'][0]['PowerConsumedWatts'])
+            return self._last_power
+        except Exception as e:
+            self.logger.error("Error reading Redfish power: %s", e)
+            return None
+
+    def _get_metadata(self) -> Dict[str, Any]:
+        """Get metadata about the current reading.
+
+        Power-supply state rides along on the body already fetched by
+        _read_power; the template is only copied when there is one.
+        """
+        body = self._last_body
+        supplies = body.get('PowerSupplies') if body else None
+        if not supplies:
+            return self._static_metadata
+        metadata = dict(self._static_metadata)
+        metadata['power_supplies'] = [
+            {
+                'name': psu.get('Name'),
+                'state': psu.get('Status', {}).get('State'),
+                'output_watts': psu.get('LastPowerOutputWatts'),
+            }
+            for psu in supplies
+        ]
+        return metadata
+
+# In-band iDRAC monitoring goes through RedfishMonitor above; for historical
+# out-of-band data use power_profiling.outofband.IDRACRemoteClient.
\ No newline at end of file
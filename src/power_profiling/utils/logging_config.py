@@ -1,4 +1,5 @@
 import logging
+import logging.handlers
 import os
 import sys
 from datetime import datetime
@@ -28,8 +29,11 @@ def setup_logging(log_level=logging.INFO, log_dir="logs"):
         '%(levelname)s - %(message)s'
     )
     
-    # Create handlers
-    file_handler = logging.FileHandler(log_file)
+    # Create handlers; rotate the log file so long profiling runs cannot
+    # grow it without bound
+    file_handler = logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=10 * 1024 * 1024, backupCount=5
+    )
     file_handler.setFormatter(file_formatter)
     file_handler.setLevel(log_level)
     
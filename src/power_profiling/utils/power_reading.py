@@ -1,26 +1,42 @@
 """Power reading data structure."""
 
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Iterable, List, Optional, Union
+
+import numpy as np
 
 class PowerReading:
-    """Class representing a single power reading."""
+    """Class representing a single power reading.
+
+    Timestamps are held as integer epoch nanoseconds (the form the sampling
+    loops produce via time.time_ns()); conversion to datetime/ISO strings is
+    deferred until something actually asks for it.
+    """
 
-    def __init__(self, 
-                 timestamp: datetime,
+    def __init__(self,
+                 timestamp: Union[datetime, int],
                  power_watts: float,
                  metadata: Optional[Dict[str, Any]] = None):
         """Initialize a power reading.
-        
+
         Args:
-            timestamp: When the reading was taken
+            timestamp: When the reading was taken, as a datetime or integer
+                epoch nanoseconds
             power_watts: Power consumption in watts
             metadata: Optional additional data about the reading
         """
-        self.timestamp = timestamp
+        if isinstance(timestamp, datetime):
+            self.timestamp_ns = int(timestamp.timestamp() * 1e9)
+        else:
+            self.timestamp_ns = int(timestamp)
         self.power_watts = power_watts
         self.metadata = metadata or {}
 
+    @property
+    def timestamp(self) -> datetime:
+        """Reading time as a datetime, converted lazily from nanoseconds."""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+
     def __repr__(self) -> str:
         """String representation of the power reading."""
         return f"PowerReading(timestamp={self.timestamp}, power_watts={self.power_watts:.2f}W)"
@@ -47,4 +63,39 @@ class PowerReading:
             timestamp=datetime.fromisoformat(data['timestamp']),
             power_watts=data['power_watts'],
             metadata=data.get('metadata', {})
-        ) 
\ No newline at end of file
+        )
+
+    @classmethod
+    def bulk_from_records(cls, records: Iterable[Dict[str, Any]]) -> List['PowerReading']:
+        """Create many PowerReadings from to_dict()-style records at once.
+
+        datetime.fromisoformat per record dominates when loading large
+        dumps; numpy parses all the ISO timestamps in one C call instead.
+
+        Args:
+            records: Iterable of dictionaries as produced by to_dict()
+
+        Returns:
+            List of PowerReading instances
+        """
+        records = list(records)
+        if not records:
+            return []
+        timestamps_ns = np.array(
+            [r['timestamp'] for r in records], dtype='datetime64[ns]'
+        ).astype(np.int64)
+        # numpy treats the naive ISO strings as UTC, while the scalar path
+        # (datetime.fromisoformat().timestamp()) treats them as local time.
+        # Re-anchor on the scalar parse of the first record so both paths
+        # agree; one dump's records share a UTC offset.
+        timestamps_ns += (
+            int(datetime.fromisoformat(records[0]['timestamp']).timestamp() * 1e9)
+            - int(timestamps_ns[0]))
+        readings = []
+        for record, ts_ns in zip(records, timestamps_ns.tolist()):
+            reading = cls.__new__(cls)
+            reading.timestamp_ns = ts_ns
+            reading.power_watts = record['power_watts']
+            reading.metadata = record.get('metadata', {})
+            readings.append(reading)
+        return readings
\ No newline at end of file
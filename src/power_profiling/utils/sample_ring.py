@@ -0,0 +1,139 @@
+"""Fixed-size single-producer/single-consumer ring buffer for power samples."""
+
+from types import MappingProxyType
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .power_reading import PowerReading
+
+# On-disk record layout for spooled samples: plain little-endian binary,
+# one (timestamp_ns, power_watts) pair per sample.
+SAMPLE_DTYPE = np.dtype([('timestamp_ns', '<i8'), ('power_watts', '<f8')])
+
+
+def write_spool(spool_file, timestamps_ns: np.ndarray, power_watts: np.ndarray) -> None:
+    """Append a batch of samples to an open binary spool file."""
+    records = np.empty(len(timestamps_ns), dtype=SAMPLE_DTYPE)
+    records['timestamp_ns'] = timestamps_ns
+    records['power_watts'] = power_watts
+    records.tofile(spool_file)
+
+
+def read_spool(path: str) -> np.ndarray:
+    """Read a spool file back as a structured array of samples."""
+    return np.fromfile(path, dtype=SAMPLE_DTYPE)
+
+
+class SampleRing:
+    """Lock-free SPSC ring buffer storing power samples as structure-of-arrays.
+
+    The sampling thread is the only writer and the thread calling
+    ``snapshot()``/``drain()`` the only reader, so plain integer index updates
+    are atomic under the GIL and no mutex is needed. Timestamps and power
+    values live in preallocated NumPy arrays, avoiding per-sample object
+    allocation and the geometric growth of ``list.append`` while many
+    monitors sample concurrently.
+    """
+
+    def __init__(self, capacity: int = 65536, coalesce: bool = False,
+                 coalesce_eps: float = 0.0):
+        """Initialize the ring.
+
+        Args:
+            capacity: Maximum number of samples retained. Older samples are
+                overwritten once the ring is full.
+            coalesce: Run-length encode steady-state power. Sensors update
+                slower than fast sampling cadences, so long runs of an
+                unchanged value carry no information; with coalescing a run
+                occupies two slots (its first sample and a trailing boundary
+                whose timestamp advances with each repeat), preserving
+                duration and trapezoidal energy while shrinking storage.
+            coalesce_eps: Absolute tolerance within which two consecutive
+                readings count as the same value.
+        """
+        self.capacity = capacity
+        self._timestamps_ns = np.zeros(capacity, dtype=np.int64)
+        self._power_watts = np.zeros(capacity, dtype=np.float64)
+        self._metadata: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._coalesce = coalesce
+        self._coalesce_eps = coalesce_eps
+        self._run_value: Optional[float] = None
+        self._run_length = 0
+        # Monotonically increasing counters; slot = counter % capacity.
+        self._head = 0  # written by the sampling thread only
+        self._tail = 0  # written by the consumer thread only
+
+    def __len__(self) -> int:
+        return min(self._head - self._tail, self.capacity)
+
+    def push(self, timestamp_ns: int, power_watts: float,
+             metadata: Optional[Dict[str, Any]] = None) -> None:
+        """Append one sample (writer side, single producer)."""
+        if self._coalesce:
+            same_run = (power_watts is not None and self._run_value is not None
+                        and abs(power_watts - self._run_value) <= self._coalesce_eps)
+            if same_run and self._run_length >= 2 and self._head > self._tail:
+                # Mid-run repeat: slide the boundary sample forward instead
+                # of spending another slot
+                slot = (self._head - 1) % self.capacity
+                self._timestamps_ns[slot] = timestamp_ns
+                self._metadata[slot] = metadata
+                self._run_length += 1
+                return
+            if same_run:
+                self._run_length += 1
+            else:
+                self._run_value = power_watts
+                self._run_length = 1
+        slot = self._head % self.capacity
+        self._timestamps_ns[slot] = timestamp_ns
+        self._power_watts[slot] = power_watts
+        self._metadata[slot] = metadata
+        # Publish last so the reader never sees a half-written slot.
+        self._head += 1
+
+    def snapshot(self) -> Tuple[np.ndarray, np.ndarray, List[Optional[Dict[str, Any]]]]:
+        """Copy the unconsumed samples without advancing the read position.
+
+        Returns:
+            Tuple of (timestamps_ns, power_watts, metadata) for the samples
+            between tail and head at the time of the call.
+        """
+        head = self._head  # single read; the writer only ever appends
+        tail = max(self._tail, head - self.capacity)
+        idx = np.arange(tail, head) % self.capacity
+        return (self._timestamps_ns[idx].copy(),
+                self._power_watts[idx].copy(),
+                [self._metadata[i] for i in idx])
+
+    def drain(self) -> Tuple[np.ndarray, np.ndarray, List[Optional[Dict[str, Any]]]]:
+        """Consume and return all unread samples (reader side)."""
+        ts, power, metadata = self.snapshot()
+        self._tail += len(ts)
+        return ts, power, metadata
+
+    def drain_readings(self) -> List[PowerReading]:
+        """Consume all unread samples as :class:`PowerReading` objects.
+
+        Frozen metadata templates (``MappingProxyType``) guard the monitors
+        against accidental mutation but are not JSON serializable, so
+        handing them to callers would break ``reading.to_dict()`` exports.
+        Each distinct template is thawed to a plain dict once per drain,
+        keeping the sharing across readings.
+        """
+        ts, power, metadata = self.drain()
+        thawed: Dict[int, Dict[str, Any]] = {}
+        readings = []
+        for t, p, m in zip(ts.tolist(), power.tolist(), metadata):
+            if type(m) is MappingProxyType:
+                plain = thawed.get(id(m))
+                if plain is None:
+                    plain = thawed[id(m)] = dict(m)
+                m = plain
+            readings.append(PowerReading(timestamp=t, power_watts=p, metadata=m))
+        return readings
+
+    def clear(self) -> None:
+        """Discard all unread samples."""
+        self._tail = self._head
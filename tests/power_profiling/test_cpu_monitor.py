@@ -4,66 +4,17 @@
 # pip install -r requirements/base.txt
 # pip install -r requirements/test.txt
 
-import unittest
+import functools
 import os
 import tempfile
-from unittest.mock import patch, MagicMock
-from src.power_profiling.monitors.cpu import IntelMonitor, AMDMonitor
+import time
+import unittest
+from unittest.mock import patch, mock_open
+from src.power_profiling.monitors.cpu import CPUMonitor, IntelMonitor, AMDMonitor
 
-class TestIntelMonitor(unittest.TestCase):
-    
-    def setUp(self):
-        # Create a temporary directory for mock files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
-        
-    def test_initialization_no_rapl(self):
-        """Test initialization when RAPL interface is not available"""
-        with patch('os.path.exists', return_value=False):
-            monitor = IntelMonitor()
-            self.assertFalse(monitor.rapl_available)
-            
-    def test_initialization_with_rapl(self):
-        """Test initialization when RAPL interface is available"""
-        # Create mock RAPL directory structure
-        rapl_path = os.path.join(self.temp_dir.name, 'intel-rapl')
-        os.makedirs(rapl_path)
-        os.makedirs(os.path.join(rapl_path, 'intel-rapl:0'))
-        
-        with patch('src.power_profiling.monitors.cpu.IntelMonitor.rapl_path', rapl_path):
-            monitor = IntelMonitor()
-            self.assertTrue(monitor.rapl_available)
-            
-    def test_read_rapl_power(self):
-        """Test reading power from Intel RAPL"""
-        # Create mock RAPL directory structure
-        rapl_path = os.path.join(self.temp_dir.name, 'intel-rapl')
-        os.makedirs(rapl_path)
-        os.makedirs(os.path.join(rapl_path, 'intel-rapl:0'))
-        
-        # Create mock energy file
-        energy_path = os.path.join(rapl_path, 'intel-rapl:0', 'energy_uj')
-        with open(energy_path, 'w') as f:
-            f.write('1000000')  # 1 joule in microjoules
-            
-        with patch('src.power_profiling.monitors.cpu.IntelMonitor.rapl_path', rapl_path):
-            monitor = IntelMonitor()
-            
-            # Mock the _read_rapl_power method to use our test file
-            with patch.object(monitor, '_read_rapl_power') as mock_read:
-                mock_read.return_value = 1.0  # 1 joule
-                power = monitor._read_power()
-                self.assertEqual(power, 1.0)
-                
-    def test_get_metadata(self):
-        """Test getting metadata"""
-        monitor = IntelMonitor()
-        
-        # Mock /proc/cpuinfo
-        cpuinfo_content = """
+# Shared cpuinfo fixtures: one blob per vendor, parsed once per process via
+# the cached helper below instead of re-scanning in every metadata test.
+INTEL_CPUINFO = """\
 processor       : 0
 vendor_id       : GenuineIntel
 cpu family      : 6
@@ -74,72 +25,8 @@ microcode       : 0x2000065
 cpu MHz         : 2400.000
 cache size      : 35840 KB
 """
-        with patch('builtins.open', MagicMock(return_value=MagicMock(
-            __enter__=MagicMock(return_value=MagicMock(
-                read=MagicMock(return_value=cpuinfo_content)
-            ))
-        ))):
-            metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'intel_rapl')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertEqual(metadata['cpu_model'], 'Intel(R) Xeon(R) CPU E5-2680 v4 @ 2.40GHz')
-            
-class TestAMDMonitor(unittest.TestCase):
-    
-    def setUp(self):
-        # Create a temporary directory for mock files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
-        
-    def test_initialization_no_k10temp(self):
-        """Test initialization when K10Temp interface is not available"""
-        with patch('os.path.exists', return_value=False):
-            monitor = AMDMonitor()
-            self.assertFalse(monitor.k10temp_available)
-            
-    def test_initialization_with_k10temp(self):
-        """Test initialization when K10Temp interface is available"""
-        # Create mock hwmon directory structure
-        hwmon_path = os.path.join(self.temp_dir.name, 'hwmon0')
-        os.makedirs(hwmon_path)
-        
-        # Create mock name file
-        with open(os.path.join(hwmon_path, 'name'), 'w') as f:
-            f.write('k10temp')
-            
-        with patch('src.power_profiling.monitors.cpu.AMDMonitor.amd_path', hwmon_path):
-            monitor = AMDMonitor()
-            self.assertTrue(monitor.k10temp_available)
-            
-    def test_read_amd_power(self):
-        """Test reading power from AMD K10Temp"""
-        # Create mock hwmon directory structure
-        hwmon_path = os.path.join(self.temp_dir.name, 'hwmon0')
-        os.makedirs(hwmon_path)
-        
-        # Create mock power file
-        power_path = os.path.join(hwmon_path, 'power1_input')
-        with open(power_path, 'w') as f:
-            f.write('1000000')  # 1 watt in microwatts
-            
-        with patch('src.power_profiling.monitors.cpu.AMDMonitor.amd_path', hwmon_path):
-            monitor = AMDMonitor()
-            
-            # Mock the _read_amd_power method to use our test file
-            with patch.object(monitor, '_read_amd_power') as mock_read:
-                mock_read.return_value = 1.0  # 1 watt
-                power = monitor._read_power()
-                self.assertEqual(power, 1.0)
-                
-    def test_get_metadata(self):
-        """Test getting metadata"""
-        monitor = AMDMonitor()
-        
-        # Mock /proc/cpuinfo
-        cpuinfo_content = """
+
+AMD_CPUINFO = """\
 processor       : 0
 vendor_id       : AuthenticAMD
 cpu family      : 23
@@ -150,15 +37,252 @@ microcode       : 0x8001129
 cpu MHz         : 2400.000
 cache size      : 16384 KB
 """
-        with patch('builtins.open', MagicMock(return_value=MagicMock(
-            __enter__=MagicMock(return_value=MagicMock(
-                read=MagicMock(return_value=cpuinfo_content)
-            ))
-        ))):
+
+RAPL_MAX_ENERGY = 262143328850
+
+
+
+@functools.lru_cache(maxsize=None)
+def _cpu_model(cpuinfo: str) -> str:
+    """Extract 'model name' from a cpuinfo blob, cached per distinct blob."""
+    for line in cpuinfo.splitlines():
+        if 'model name' in line:
+            return line.split(':')[1].strip()
+    return ''
+
+
+class _TempDirTestCase(unittest.TestCase):
+    """Base class sharing one temporary directory across a test class."""
+
+    @classmethod
+    def setUpClass(cls):
+        # One temporary directory for the whole class; each test carves out
+        # its own subdirectory instead of paying mkdir/rmdir per test
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.root = cls._tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
+    def setUp(self):
+        self.temp_path = tempfile.mkdtemp(dir=self.root)
+
+
+class _CPUMetadataMixin:
+    """Shared metadata assertions parametrized by class attributes.
+
+    The Intel and AMD metadata tests are the same scenario against a
+    different cpuinfo blob and monitor type; the mixin runs it once per
+    class instead of duplicating the mock plumbing.
+    """
+
+    CPUINFO = None
+    EXPECTED_TYPE = None
+
+    def _metadata_monitor(self):
+        raise NotImplementedError
+
+    def test_get_metadata(self):
+        """Metadata includes the CPU model parsed from /proc/cpuinfo"""
+        monitor = self._metadata_monitor()
+        with patch('builtins.open', mock_open(read_data=self.CPUINFO)):
             metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'amd_k10temp')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertEqual(metadata['cpu_model'], 'AMD EPYC 7351 16-Core Processor')
-            
+        self.assertEqual(metadata['monitor_type'], self.EXPECTED_TYPE)
+        self.assertEqual(metadata['sampling_interval'], 0.1)
+        self.assertEqual(metadata['cpu_model'], _cpu_model(self.CPUINFO))
+
+
+class TestCPUMonitor(unittest.TestCase):
+
+    def test_read_power_not_implemented(self):
+        """The abstract base must refuse to read power directly"""
+        monitor = CPUMonitor(sampling_interval=0.1)
+        with self.assertRaises(NotImplementedError):
+            monitor._read_power()
+
+    def test_get_metadata(self):
+        """Abstract metadata carries the monitor type and interval"""
+        monitor = CPUMonitor(sampling_interval=0.1)
+        metadata = monitor._get_metadata()
+        self.assertEqual(metadata['monitor_type'], 'abstract_cpu')
+        self.assertEqual(metadata['sampling_interval'], 0.1)
+
+
+class TestIntelMonitor(_CPUMetadataMixin, _TempDirTestCase):
+
+    CPUINFO = INTEL_CPUINFO
+    EXPECTED_TYPE = 'intel_rapl'
+
+    def _build_rapl_tree(self, energy='1000000'):
+        """Create a fake RAPL sysfs tree and return (base_path, domain_path)."""
+        base_path = os.path.join(self.temp_path, 'intel-rapl')
+        domain_path = os.path.join(base_path, 'intel-rapl:0')
+        os.makedirs(domain_path)
+        with open(os.path.join(domain_path, 'name'), 'w') as f:
+            f.write('package-0')
+        with open(os.path.join(domain_path, 'energy_uj'), 'w') as f:
+            f.write(energy)
+        with open(os.path.join(domain_path, 'max_energy_range_uj'), 'w') as f:
+            f.write(str(RAPL_MAX_ENERGY))
+        return base_path, domain_path
+
+    def _make_monitor(self, energy_path, **kwargs):
+        """Construct an IntelMonitor against a fake energy counter file."""
+        with patch.object(IntelMonitor, '_find_rapl_domain',
+                          return_value=('package-0', energy_path, RAPL_MAX_ENERGY)), \
+             patch('src.power_profiling.monitors.cpu._HAS_INTEL_RAPL', True):
+            return IntelMonitor(**kwargs)
+
+    def test_initialization_no_rapl(self):
+        """Initialization fails when the cached probe found no RAPL"""
+        with patch('src.power_profiling.monitors.cpu._HAS_INTEL_RAPL', False):
+            with self.assertRaises(RuntimeError):
+                IntelMonitor()
+
+    def test_initialization_no_domains(self):
+        """Initialization fails when the RAPL tree holds no domains"""
+        with patch('src.power_profiling.monitors.cpu._HAS_INTEL_RAPL', True), \
+             patch('src.power_profiling.monitors.cpu.os.listdir', return_value=[]):
+            with self.assertRaises(RuntimeError):
+                IntelMonitor()
+
+    def test_find_rapl_domain(self):
+        """Domain discovery picks package-0 and reads its max energy range"""
+        base_path, domain_path = self._build_rapl_tree()
+        monitor = self._make_monitor(os.path.join(domain_path, 'energy_uj'))
+        monitor.rapl_base_path = base_path
+        name, energy_path, max_energy = monitor._find_rapl_domain(None)
+        self.assertEqual(name, 'package-0')
+        self.assertEqual(energy_path, os.path.join(domain_path, 'energy_uj'))
+        self.assertEqual(max_energy, RAPL_MAX_ENERGY)
+
+    def test_read_power(self):
+        """The persistent fd reads the energy counter in joules"""
+        _, domain_path = self._build_rapl_tree(energy='1500000')
+        monitor = self._make_monitor(os.path.join(domain_path, 'energy_uj'))
+        self.assertEqual(monitor._read_power(), 1.5)
+
+    def test_stop_observed_while_falling_behind(self):
+        """A tick slower than the interval must still honour stop()"""
+        _, domain_path = self._build_rapl_tree()
+        monitor = self._make_monitor(os.path.join(domain_path, 'energy_uj'),
+                                     sampling_interval=0.001)
+        with patch.object(monitor, '_sample_tick',
+                          side_effect=lambda ts: time.sleep(0.005)):
+            monitor.start()
+            time.sleep(0.02)
+            monitor._stop_event.set()
+            monitor._thread.join(timeout=2.0)
+            self.assertFalse(monitor._thread.is_alive())
+
+    def test_forwards_base_monitor_kwargs(self):
+        """Ring options and monitor_cpu reach BasePowerMonitor"""
+        _, domain_path = self._build_rapl_tree()
+        monitor = self._make_monitor(os.path.join(domain_path, 'energy_uj'),
+                                     max_samples=128, coalesce=True,
+                                     monitor_cpu=0)
+        self.assertEqual(monitor._ring.capacity, 128)
+        self.assertEqual(monitor.monitor_cpu, 0)
+
+    def test_sample_tick(self):
+        """A tick pair derives watts from the energy delta and stores it"""
+        _, domain_path = self._build_rapl_tree(energy='1000000')
+        energy_path = os.path.join(domain_path, 'energy_uj')
+        monitor = self._make_monitor(energy_path)
+
+        # Priming tick has no previous counter value to diff against
+        self.assertIsNone(monitor._sample_tick(1_000_000_000))
+
+        with open(energy_path, 'w') as f:
+            f.write('1100000')
+        # 100000 uJ over 0.1 s is 1 W
+        watts = monitor._sample_tick(1_100_000_000)
+        self.assertAlmostEqual(watts, 1.0)
+
+        # Each stored sample carries the cached static metadata template
+        _, _, metadata = monitor.snapshot_samples()
+        self.assertEqual(metadata[0]['monitor_type'], 'intel_rapl')
+        self.assertIs(metadata[0], monitor._static_metadata)
+        timestamps, power, _ = monitor.snapshot_samples()
+        self.assertEqual(len(timestamps), 1)
+        self.assertAlmostEqual(power[0], 1.0)
+
+    def test_sample_tick_wraparound(self):
+        """A counter wrap is corrected with max_energy_range_uj"""
+        _, domain_path = self._build_rapl_tree(energy=str(RAPL_MAX_ENERGY - 50000))
+        energy_path = os.path.join(domain_path, 'energy_uj')
+        monitor = self._make_monitor(energy_path)
+
+        monitor._sample_tick(1_000_000_000)
+        with open(energy_path, 'w') as f:
+            f.write('50000')
+        # Wrapped delta is 100000 uJ over 0.1 s: still 1 W
+        watts = monitor._sample_tick(1_100_000_000)
+        self.assertAlmostEqual(watts, 1.0)
+
+    def _metadata_monitor(self):
+        _, domain_path = self._build_rapl_tree()
+        return self._make_monitor(os.path.join(domain_path, 'energy_uj'))
+
+
+class TestAMDMonitor(_CPUMetadataMixin, _TempDirTestCase):
+
+    CPUINFO = AMD_CPUINFO
+    EXPECTED_TYPE = 'amd_k10temp'
+
+    def _make_monitor(self, **kwargs):
+        """Construct an AMDMonitor with the k10temp interface mocked present."""
+        with patch('src.power_profiling.monitors.cpu._HAS_K10TEMP', True), \
+             patch('builtins.open', mock_open(read_data='k10temp')), \
+             patch('src.power_profiling.monitors.cpu.os.open',
+                   side_effect=OSError('no such file')):
+            return AMDMonitor(**kwargs)
+
+    def _write_power_file(self, value):
+        """Create a fake power1_input file and return its path."""
+        power_path = os.path.join(self.temp_path, 'power1_input')
+        with open(power_path, 'w') as f:
+            f.write(value)
+        return power_path
+
+    def test_initialization_no_hwmon(self):
+        """Initialization fails when the cached probe found no hwmon"""
+        with patch('src.power_profiling.monitors.cpu._HAS_K10TEMP', False):
+            with self.assertRaises(RuntimeError):
+                AMDMonitor()
+
+    def test_initialization_wrong_driver(self):
+        """Initialization fails when hwmon0 is not k10temp"""
+        with patch('src.power_profiling.monitors.cpu._HAS_K10TEMP', True), \
+             patch('builtins.open', mock_open(read_data='coretemp')):
+            with self.assertRaises(RuntimeError):
+                AMDMonitor()
+
+    def test_read_power_pread(self):
+        """The persistent fd path converts microwatts to watts"""
+        monitor = self._make_monitor()
+        power_path = self._write_power_file('2000000')
+        monitor.power_path = power_path
+        monitor._power_fd = os.open(power_path, os.O_RDONLY)
+        self.assertEqual(monitor._read_power(), 2.0)
+
+    def test_read_power_fallback(self):
+        """Without a persistent fd, reading falls back to open()"""
+        monitor = self._make_monitor()
+        monitor.power_path = self._write_power_file('1000000')
+        self.assertIsNone(monitor._power_fd)
+        self.assertEqual(monitor._read_power(), 1.0)
+
+    def test_read_power_failure(self):
+        """A missing power file yields None, not an exception"""
+        monitor = self._make_monitor()
+        monitor.power_path = os.path.join(self.temp_path, 'missing')
+        self.assertIsNone(monitor._read_power())
+
+    def _metadata_monitor(self):
+        return self._make_monitor()
+
+
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -4,245 +4,328 @@
 # pip install -r requirements/base.txt
 # pip install -r requirements/test.txt
 
-import unittest
+import contextlib
 import os
 import tempfile
-from unittest.mock import patch, MagicMock
-from src.power_profiling.monitors.gpu import NvidiaGPUMonitor, AMDGPUMonitor
+import types
+import unittest
+from unittest.mock import patch, mock_open, MagicMock
+from src.power_profiling.monitors.gpu import GPUMonitor, NvidiaGPUMonitor, AMDGPUMonitor
+
+
+class _FakeNVMLError(Exception):
+    """Stands in for pynvml.NVMLError in the fake bindings."""
+
+
+# Prebuilt return-value sentinels, constructed once at import: the fakes
+# hand these out by reference instead of rebuilding nested mock objects
+# for every test.
+_DEVICE_NAME = b'Tesla V100'
+_MEMORY_INFO = types.SimpleNamespace(total=16 * 2**30, used=2**30)
+_UTILIZATION = types.SimpleNamespace(gpu=55, memory=40)
+_TEMPERATURE = 63
+_SM_CLOCK = 1380
+
+
+def _fake_nvml(device_count=1, power_mw=100000):
+    """Build a fake pynvml namespace covering the calls the monitor makes."""
+    nvml = types.SimpleNamespace()
+    nvml.NVMLError = _FakeNVMLError
+    nvml.NVML_SUCCESS = 0
+    nvml.NVML_TEMPERATURE_GPU = 0
+    nvml.NVML_CLOCK_SM = 1
+    nvml.NVML_CLOCK_MEM = 2
+    nvml.nvmlInit = MagicMock()
+    nvml.nvmlShutdown = MagicMock()
+    nvml.nvmlDeviceGetCount = MagicMock(return_value=device_count)
+    nvml.nvmlDeviceGetHandleByIndex = MagicMock(side_effect=lambda idx: f'handle-{idx}')
+    nvml.nvmlDeviceGetName = MagicMock(return_value=_DEVICE_NAME)
+    nvml.nvmlDeviceGetMemoryInfo = MagicMock(return_value=_MEMORY_INFO)
+    nvml.nvmlDeviceGetPowerUsage = MagicMock(return_value=power_mw)
+    nvml.nvmlDeviceGetUtilizationRates = MagicMock(return_value=_UTILIZATION)
+    nvml.nvmlDeviceGetTemperature = MagicMock(return_value=_TEMPERATURE)
+    nvml.nvmlDeviceGetClockInfo = MagicMock(return_value=_SM_CLOCK)
+    return nvml
+
+
+def _patched_nvml(nvml):
+    """Install the fake bindings into the gpu module for the duration."""
+    return patch.multiple('src.power_profiling.monitors.gpu',
+                          pynvml=nvml, NVML_AVAILABLE=True, create=True)
+
+
+@contextlib.contextmanager
+def _nvidia_monitor(nvml, **kwargs):
+    """Yield an NvidiaGPUMonitor built against the fake bindings.
+
+    The NVML reference is released before the patch unwinds so the
+    monitor's __del__ never touches the real (absent) library.
+    """
+    with _patched_nvml(nvml):
+        monitor = NvidiaGPUMonitor(**kwargs)
+        try:
+            yield monitor
+        finally:
+            monitor._release_nvml()
+
+
+class TestGPUMonitor(unittest.TestCase):
+
+    def test_read_power_not_implemented(self):
+        """The abstract base must refuse to read power directly"""
+        monitor = GPUMonitor(sampling_interval=0.1)
+        with self.assertRaises(NotImplementedError):
+            monitor._read_power()
+
+    def test_get_metadata(self):
+        """Abstract metadata carries the monitor type and device index"""
+        monitor = GPUMonitor(sampling_interval=0.1, device_index=2)
+        metadata = monitor._get_metadata()
+        self.assertEqual(metadata['monitor_type'], 'abstract_gpu')
+        self.assertEqual(metadata['device_index'], 2)
+
 
 class TestNvidiaGPUMonitor(unittest.TestCase):
-    
-    def setUp(self):
-        # Create a temporary directory for mock files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
-        
-    def test_initialization_no_gpus(self):
-        """Test initialization when no NVIDIA GPUs are available"""
-        with patch.object(NvidiaGPUMonitor, '_get_available_gpus', return_value=[]):
-            monitor = NvidiaGPUMonitor()
-            self.assertEqual(monitor.gpu_ids, [])
-            
-    def test_initialization_with_gpus(self):
-        """Test initialization with available NVIDIA GPUs"""
-        with patch.object(NvidiaGPUMonitor, '_get_available_gpus', return_value=[0, 1]):
-            monitor = NvidiaGPUMonitor()
-            self.assertEqual(monitor.gpu_ids, [0, 1])
-            
-    def test_initialization_with_specific_gpus(self):
-        """Test initialization with specific GPU IDs"""
-        monitor = NvidiaGPUMonitor(gpu_ids=[0, 2])
-        self.assertEqual(monitor.gpu_ids, [0, 2])
-        
-    def test_get_available_gpus_success(self):
-        """Test successful GPU detection"""
-        mock_output = "0\n1\n2\n"
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                stdout=mock_output,
-                returncode=0
-            )
-            gpus = NvidiaGPUMonitor._get_available_gpus(None)
-            self.assertEqual(gpus, [0, 1, 2])
-            
-    def test_get_available_gpus_failure(self):
-        """Test GPU detection failure"""
-        with patch('subprocess.run', side_effect=Exception("Test error")):
-            gpus = NvidiaGPUMonitor._get_available_gpus(None)
-            self.assertEqual(gpus, [])
-            
-    def test_read_power_no_gpus(self):
-        """Test power reading when no GPUs are available"""
-        monitor = NvidiaGPUMonitor(gpu_ids=[])
-        power = monitor._read_power()
-        self.assertIsNone(power)
-        
-    def test_read_power_success(self):
-        """Test successful power reading"""
-        mock_output = "0, 100.0 W\n1, 150.0 W\n"
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                stdout=mock_output,
-                returncode=0
-            )
-            
-            monitor = NvidiaGPUMonitor(gpu_ids=[0, 1])
-            power = monitor._read_power()
-            self.assertEqual(power, 250.0)  # 100 + 150 watts
-            
-    def test_read_power_partial_success(self):
-        """Test power reading with some GPUs available"""
-        mock_output = "0, 100.0 W\n1, 150.0 W\n"
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                stdout=mock_output,
-                returncode=0
-            )
-            
-            monitor = NvidiaGPUMonitor(gpu_ids=[0, 2])  # Only GPU 0 is in the output
-            power = monitor._read_power()
-            self.assertEqual(power, 100.0)  # Only 100 watts from GPU 0
-            
+
+    def test_initialization_requires_pynvml(self):
+        """Initialization fails cleanly when pynvml is not installed"""
+        with patch('src.power_profiling.monitors.gpu.NVML_AVAILABLE', False):
+            with self.assertRaises(ImportError):
+                NvidiaGPUMonitor()
+
+    def test_initialization(self):
+        """Initialization resolves handles and caches static metadata"""
+        with _nvidia_monitor(_fake_nvml()) as monitor:
+            self.assertEqual(monitor.device_name, 'Tesla V100')
+            self.assertEqual(monitor.gpu_ids, [0])
+            self.assertEqual(monitor.devices, ['handle-0'])
+            self.assertEqual(monitor._static_metadata['memory_total'], _MEMORY_INFO.total)
+
+    def test_initialization_with_gpu_ids(self):
+        """gpu_ids selects which devices get handles"""
+        with _nvidia_monitor(_fake_nvml(device_count=4), gpu_ids=[1, 3]) as monitor:
+            self.assertEqual(monitor.gpu_ids, [1, 3])
+            self.assertEqual(monitor.devices, ['handle-1', 'handle-3'])
+            # Multi-GPU init probes every card (in parallel) for the template
+            self.assertEqual(monitor._static_metadata['gpu_info'], [
+                {'name': 'Tesla V100', 'memory_total': _MEMORY_INFO.total},
+                {'name': 'Tesla V100', 'memory_total': _MEMORY_INFO.total},
+            ])
+
+    def test_initialization_index_out_of_range(self):
+        """A gpu id beyond the device count is rejected"""
+        with _patched_nvml(_fake_nvml(device_count=1)):
+            with self.assertRaises(RuntimeError):
+                NvidiaGPUMonitor(gpu_ids=[0, 1])
+
+    def test_read_power_single_gpu(self):
+        """Single-GPU power converts milliwatts to watts"""
+        with _nvidia_monitor(_fake_nvml(power_mw=100000)) as monitor:
+            self.assertEqual(monitor._read_power(), 100.0)
+
+    def test_read_power_multi_gpu(self):
+        """Multi-GPU power is the sum across the monitored devices"""
+        with _nvidia_monitor(_fake_nvml(device_count=2, power_mw=100000),
+                             gpu_ids=[0, 1]) as monitor:
+            self.assertEqual(monitor._read_power(), 200.0)
+
     def test_read_power_failure(self):
-        """Test power reading failure"""
-        with patch('subprocess.run', side_effect=Exception("Test error")):
-            monitor = NvidiaGPUMonitor(gpu_ids=[0, 1])
-            power = monitor._read_power()
-            self.assertIsNone(power)
-            
+        """An NVML error yields None, not an exception"""
+        nvml = _fake_nvml()
+        with _nvidia_monitor(nvml) as monitor:
+            nvml.nvmlDeviceGetPowerUsage.side_effect = _FakeNVMLError('lost GPU')
+            self.assertIsNone(monitor._read_power())
+
+    def test_read_power_field_values(self):
+        """The batched field-values path serves power and energy together"""
+        nvml = _fake_nvml()
+        nvml.NVML_FI_DEV_POWER_INSTANT = 186
+        nvml.NVML_FI_DEV_TOTAL_ENERGY_CONSUMPTION = 83
+        nvml.NVML_VALUE_TYPE_DOUBLE = 0
+        nvml.NVML_VALUE_TYPE_UNSIGNED_INT = 1
+        nvml.NVML_VALUE_TYPE_SIGNED_INT = 2
+        power_value = types.SimpleNamespace(
+            nvmlReturn=0, valueType=1, value=types.SimpleNamespace(uiVal=123000))
+        energy_value = types.SimpleNamespace(
+            nvmlReturn=0, valueType=3, value=types.SimpleNamespace(ullVal=5000000))
+        nvml.nvmlDeviceGetFieldValues = MagicMock(
+            return_value=[power_value, energy_value])
+        with _nvidia_monitor(nvml) as monitor:
+            self.assertEqual(monitor._power_field_ids, [186, 83])
+            self.assertEqual(monitor._read_power(), 123.0)
+            self.assertEqual(monitor._last_total_energy_mj, 5000000)
+            self.assertEqual(monitor._get_metadata()['total_energy_mj'], 5000000)
+
     def test_get_metadata(self):
-        """Test getting metadata"""
-        monitor = NvidiaGPUMonitor(gpu_ids=[0, 1])
-        
-        # Mock nvidia-smi output
-        mock_output = "0, Tesla V100, 16384 MiB, 450.80.02\n1, Tesla V100, 16384 MiB, 450.80.02\n"
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                stdout=mock_output,
-                returncode=0
-            )
-            
+        """Metadata merges dynamic counters over the cached template"""
+        with _nvidia_monitor(_fake_nvml()) as monitor:
             metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'nvidia_gpu')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertEqual(metadata['gpu_ids'], [0, 1])
-            self.assertIn('gpu_info', metadata)
-            self.assertEqual(len(metadata['gpu_info']), 2)
-            self.assertEqual(metadata['gpu_info']['gpu_0']['name'], 'Tesla V100')
-            self.assertEqual(metadata['gpu_info']['gpu_1']['name'], 'Tesla V100')
-            
-    def test_get_metadata_failure(self):
-        """Test metadata collection failure"""
-        with patch('subprocess.run', side_effect=Exception("Test error")):
-            monitor = NvidiaGPUMonitor(gpu_ids=[0, 1])
-            metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'nvidia_gpu')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertEqual(metadata['gpu_ids'], [0, 1])
-            self.assertNotIn('gpu_info', metadata)
-            
+        self.assertEqual(metadata['monitor_type'], 'nvidia_gpu')
+        self.assertEqual(metadata['device_name'], 'Tesla V100')
+        self.assertEqual(metadata['gpu_util'], _UTILIZATION.gpu)
+        self.assertEqual(metadata['memory_used'], _MEMORY_INFO.used)
+        self.assertEqual(metadata['temperature'], _TEMPERATURE)
+        self.assertEqual(metadata['sm_clock'], _SM_CLOCK)
+
+    def test_drain_hw_samples(self):
+        """Driver-buffered samples land in the ring with ns timestamps"""
+        nvml = _fake_nvml()
+        nvml.NVML_TOTAL_POWER_SAMPLES = 0
+        nvml.NVML_ERROR_NOT_FOUND = -6
+        samples = [
+            types.SimpleNamespace(timeStamp=1_000_000,
+                                  sampleValue=types.SimpleNamespace(uiVal=100000)),
+            types.SimpleNamespace(timeStamp=1_050_000,
+                                  sampleValue=types.SimpleNamespace(uiVal=150000)),
+        ]
+        nvml.nvmlDeviceGetSamples = MagicMock(return_value=(None, samples))
+        with _nvidia_monitor(nvml, use_hw_samples=True) as monitor:
+            self.assertEqual(monitor._drain_hw_samples(), 2)
+            self.assertEqual(monitor._last_hw_sample_us, 1_050_000)
+            timestamps, power, _ = monitor.snapshot_samples()
+        self.assertEqual(list(timestamps), [1_000_000_000, 1_050_000_000])
+        self.assertEqual(list(power), [100.0, 150.0])
+
+
 class TestAMDGPUMonitor(unittest.TestCase):
-    
+
+    @classmethod
+    def setUpClass(cls):
+        # One temporary directory for the whole class; each test carves out
+        # its own subdirectory instead of paying mkdir/rmdir per test
+        cls._tmp = tempfile.TemporaryDirectory()
+        cls.root = cls._tmp.name
+
+    @classmethod
+    def tearDownClass(cls):
+        cls._tmp.cleanup()
+
     def setUp(self):
-        # Create a temporary directory for mock files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
-        
-    def test_initialization_no_gpus(self):
-        """Test initialization when no AMD GPUs are available"""
-        with patch.object(AMDGPUMonitor, '_get_available_gpus', return_value=[]):
-            monitor = AMDGPUMonitor()
-            self.assertEqual(monitor.gpu_ids, [])
-            
-    def test_initialization_with_gpus(self):
-        """Test initialization with available AMD GPUs"""
-        with patch.object(AMDGPUMonitor, '_get_available_gpus', return_value=[0, 1]):
-            monitor = AMDGPUMonitor()
-            self.assertEqual(monitor.gpu_ids, [0, 1])
-            
-    def test_initialization_with_specific_gpus(self):
-        """Test initialization with specific GPU IDs"""
-        monitor = AMDGPUMonitor(gpu_ids=[0, 2])
-        self.assertEqual(monitor.gpu_ids, [0, 2])
-        
-    def test_get_available_gpus_success(self):
-        """Test successful GPU detection"""
-        # Create mock sysfs directory structure
-        sysfs_path = os.path.join(self.temp_dir.name, 'sys', 'class', 'drm')
-        os.makedirs(sysfs_path)
-        
-        # Create mock card directories
-        os.makedirs(os.path.join(sysfs_path, 'card0'))
-        os.makedirs(os.path.join(sysfs_path, 'card1'))
-        
-        with patch('os.listdir', return_value=['card0', 'card1']):
-            with patch('os.path.exists', return_value=True):
-                gpus = AMDGPUMonitor._get_available_gpus(None)
-                self.assertEqual(gpus, [0, 1])
-                
-    def test_get_available_gpus_failure(self):
-        """Test GPU detection failure"""
-        with patch('os.listdir', side_effect=Exception("Test error")):
-            gpus = AMDGPUMonitor._get_available_gpus(None)
-            self.assertEqual(gpus, [])
-            
-    def test_read_power_no_gpus(self):
-        """Test power reading when no GPUs are available"""
-        monitor = AMDGPUMonitor(gpu_ids=[])
-        power = monitor._read_power()
-        self.assertIsNone(power)
-        
-    def test_read_power_success(self):
-        """Test successful power reading"""
-        # Create mock sysfs directory structure
-        sysfs_path = os.path.join(self.temp_dir.name, 'sys', 'class', 'drm', 'card0')
-        os.makedirs(sysfs_path)
-        
-        # Create mock power file
-        power_path = os.path.join(sysfs_path, 'device', 'power1_input')
-        os.makedirs(os.path.dirname(power_path))
-        with open(power_path, 'w') as f:
-            f.write('100000')  # 100 watts in microwatts
-            
-        with patch('os.path.exists', return_value=True):
-            with patch('builtins.open', MagicMock(return_value=MagicMock(
-                __enter__=MagicMock(return_value=MagicMock(
-                    read=MagicMock(return_value='100000')
-                ))
-            ))):
-                monitor = AMDGPUMonitor(gpu_ids=[0])
-                power = monitor._read_power()
-                self.assertEqual(power, 100.0)  # 100 watts
-                
+        self.temp_path = tempfile.mkdtemp(dir=self.root)
+
+    def _build_hwmon_tree(self, power='100000000', temp='63000', fan='1500'):
+        """Create a fake amdgpu hwmon directory and return its path."""
+        hwmon_path = os.path.join(self.temp_path, 'hwmon0')
+        os.makedirs(hwmon_path)
+        for filename, value in (('name', 'amdgpu'), ('power1_input', power),
+                                ('temp1_input', temp), ('fan1_input', fan)):
+            with open(os.path.join(hwmon_path, filename), 'w') as f:
+                f.write(value)
+        return hwmon_path
+
+    def _make_monitor(self, hwmon_path, **kwargs):
+        """Construct an AMDGPUMonitor against a fake hwmon directory."""
+        with patch.object(AMDGPUMonitor, '_find_amd_gpu_path',
+                          return_value=hwmon_path):
+            return AMDGPUMonitor(**kwargs)
+
+    def test_initialization_no_interface(self):
+        """Initialization fails when no amdgpu hwmon entry exists"""
+        with patch.object(AMDGPUMonitor, '_find_amd_gpu_path', return_value=None):
+            with self.assertRaises(RuntimeError):
+                AMDGPUMonitor()
+
+    def test_initialization(self):
+        """Initialization resolves sensor paths and the device name once"""
+        hwmon_path = self._build_hwmon_tree()
+        monitor = self._make_monitor(hwmon_path)
+        self.assertEqual(monitor.power_path, os.path.join(hwmon_path, 'power1_input'))
+        self.assertEqual(monitor.temp_path, os.path.join(hwmon_path, 'temp1_input'))
+        self.assertEqual(monitor.fan_path, os.path.join(hwmon_path, 'fan1_input'))
+        self.assertEqual(monitor._static_metadata['device_name'], 'amdgpu')
+
+    def test_forwards_base_monitor_kwargs(self):
+        """Ring options and monitor_cpu reach BasePowerMonitor"""
+        hwmon_path = self._build_hwmon_tree()
+        monitor = self._make_monitor(hwmon_path, max_samples=128,
+                                     coalesce=True, monitor_cpu=0)
+        self.assertEqual(monitor._ring.capacity, 128)
+        self.assertEqual(monitor.monitor_cpu, 0)
+
+    @staticmethod
+    def _scandir(layout):
+        """Fake os.scandir: maps path -> DirEntry-like namespaces."""
+        @contextlib.contextmanager
+        def scandir(path):
+            entries = layout.get(path)
+            if entries is None:
+                raise OSError('no such directory')
+            yield iter(entries)
+        return scandir
+
+    @staticmethod
+    def _entry(root, name):
+        return types.SimpleNamespace(name=name, path=os.path.join(root, name))
+
+    def test_find_path_falls_back_to_hwmon_scan(self):
+        """When the DRM link is absent, the hwmon class scan is used"""
+        layout = {'/sys/class/hwmon': [self._entry('/sys/class/hwmon', 'hwmon3')]}
+        with patch('src.power_profiling.monitors.gpu.os.scandir',
+                   side_effect=self._scandir(layout)), \
+             patch('builtins.open', mock_open(read_data='amdgpu')):
+            path = AMDGPUMonitor.__new__(AMDGPUMonitor)
+            path.device_index = 0
+            found = AMDGPUMonitor._find_amd_gpu_path(path)
+        self.assertEqual(found, '/sys/class/hwmon/hwmon3')
+
+    def test_get_available_gpus(self):
+        """Only cardN entries with a hwmon directory are listed"""
+        drm = '/sys/class/drm'
+        layout = {drm: [self._entry(drm, name)
+                        for name in ('card1', 'card0', 'card0-DP-1',
+                                     'renderD128', 'version')]}
+        with patch('src.power_profiling.monitors.gpu.os.scandir',
+                   side_effect=self._scandir(layout)), \
+             patch('src.power_profiling.monitors.gpu.os.path.isdir',
+                   side_effect=lambda p: 'card0' in p):
+            self.assertEqual(AMDGPUMonitor._get_available_gpus(), [0])
+
+    def test_get_available_gpus_no_drm(self):
+        """An unreadable /sys/class/drm yields an empty list"""
+        with patch('src.power_profiling.monitors.gpu.os.scandir',
+                   side_effect=self._scandir({})):
+            self.assertEqual(AMDGPUMonitor._get_available_gpus(), [])
+
+    def test_read_power(self):
+        """Power is pread from the persistent fd and converted to watts"""
+        monitor = self._make_monitor(self._build_hwmon_tree(power='100000000'))
+        self.assertIsNotNone(monitor._power_fd)
+        self.assertEqual(monitor._read_power(), 100.0)
+
+    def test_read_power_fallback_to_open(self):
+        """Without a persistent fd, power is read via open()"""
+        monitor = self._make_monitor(self._build_hwmon_tree(power='100000000'))
+        os.close(monitor._power_fd)
+        monitor._power_fd = None
+        self.assertEqual(monitor._read_power(), 100.0)
+
     def test_read_power_failure(self):
-        """Test power reading failure"""
-        with patch('os.path.exists', return_value=False):
-            monitor = AMDGPUMonitor(gpu_ids=[0])
-            power = monitor._read_power()
-            self.assertIsNone(power)
-            
+        """A missing power file yields None, not an exception"""
+        monitor = self._make_monitor(self._build_hwmon_tree())
+        os.close(monitor._power_fd)
+        monitor._power_fd = None
+        monitor.power_path = os.path.join(self.temp_path, 'missing')
+        self.assertIsNone(monitor._read_power())
+
     def test_get_metadata(self):
-        """Test getting metadata"""
-        monitor = AMDGPUMonitor(gpu_ids=[0, 1])
-        
-        # Mock sysfs directory structure
-        sysfs_path = os.path.join(self.temp_dir.name, 'sys', 'class', 'drm', 'card0')
-        os.makedirs(sysfs_path)
-        
-        # Create mock name file
-        name_path = os.path.join(sysfs_path, 'device', 'name')
-        os.makedirs(os.path.dirname(name_path))
-        with open(name_path, 'w') as f:
-            f.write('AMD Radeon RX 6800 XT')
-            
-        with patch('os.path.exists', return_value=True):
-            with patch('builtins.open', MagicMock(return_value=MagicMock(
-                __enter__=MagicMock(return_value=MagicMock(
-                    read=MagicMock(return_value='AMD Radeon RX 6800 XT')
-                ))
-            ))):
-                metadata = monitor._get_metadata()
-                self.assertEqual(metadata['monitor_type'], 'amd_gpu')
-                self.assertEqual(metadata['sampling_interval'], 0.1)
-                self.assertEqual(metadata['gpu_ids'], [0, 1])
-                self.assertIn('gpu_info', metadata)
-                self.assertEqual(metadata['gpu_info']['gpu_0']['name'], 'AMD Radeon RX 6800 XT')
-                
-    def test_get_metadata_failure(self):
-        """Test metadata collection failure"""
-        with patch('os.path.exists', return_value=False):
-            monitor = AMDGPUMonitor(gpu_ids=[0, 1])
-            metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'amd_gpu')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertEqual(metadata['gpu_ids'], [0, 1])
-            self.assertNotIn('gpu_info', metadata)
-            
+        """Metadata reads the precomputed sensor paths"""
+        monitor = self._make_monitor(self._build_hwmon_tree())
+        metadata = monitor._get_metadata()
+        self.assertEqual(metadata['monitor_type'], 'amd_gpu')
+        self.assertEqual(metadata['device_name'], 'amdgpu')
+        self.assertEqual(metadata['temperature'], 63.0)
+        self.assertEqual(metadata['fan_speed'], 1500)
+
+    def test_get_metadata_without_optional_sensors(self):
+        """Absent temp/fan sensors are skipped without error"""
+        hwmon_path = self._build_hwmon_tree()
+        os.unlink(os.path.join(hwmon_path, 'temp1_input'))
+        os.unlink(os.path.join(hwmon_path, 'fan1_input'))
+        monitor = self._make_monitor(hwmon_path)
+        metadata = monitor._get_metadata()
+        self.assertNotIn('temperature', metadata)
+        self.assertNotIn('fan_speed', metadata)
+
+
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+
+# Before running these tests, ensure you have installed dependencies:
+# pip install -r requirements/base.txt
+# pip install -r requirements/test.txt
+
+import time
+import unittest
+
+from src.power_profiling.monitors.base import BasePowerMonitor
+from src.power_profiling.monitors.reactor import MonitorReactor, build_monitors
+
+
+class _CountingMonitor(BasePowerMonitor):
+    """Minimal monitor whose readings just count up."""
+
+    def __init__(self, sampling_interval=0.001, **kwargs):
+        super().__init__(sampling_interval, **kwargs)
+        self.reads = 0
+
+    def _read_power(self):
+        self.reads += 1
+        return float(self.reads)
+
+    def _get_metadata(self):
+        return {'monitor_type': 'counting'}
+
+
+class TestBuildMonitors(unittest.TestCase):
+
+    def test_empty_factories(self):
+        """No factories build no monitors"""
+        self.assertEqual(build_monitors([]), [])
+
+    def test_preserves_factory_order(self):
+        """Monitors come back in factory order despite parallel construction"""
+        intervals = [0.001 * (i + 1) for i in range(5)]
+        factories = [lambda i=i: _CountingMonitor(sampling_interval=i)
+                     for i in intervals]
+        monitors = build_monitors(factories)
+        self.assertEqual([m.sampling_interval for m in monitors], intervals)
+
+    def test_factory_exception_propagates(self):
+        """A failing factory surfaces its exception to the caller"""
+        def broken():
+            raise RuntimeError("no such BMC")
+        with self.assertRaises(RuntimeError):
+            build_monitors([lambda: _CountingMonitor(), broken])
+
+
+class TestMonitorReactor(unittest.TestCase):
+
+    def test_start_requires_monitors(self):
+        """Starting an empty reactor is an error, not a silent no-op"""
+        with self.assertRaises(RuntimeError):
+            MonitorReactor().start()
+
+    def test_add_monitor_while_running_raises(self):
+        """The monitor list is fixed once the reactor thread is up"""
+        reactor = MonitorReactor()
+        reactor.add_monitor(_CountingMonitor())
+        reactor.start()
+        try:
+            with self.assertRaises(RuntimeError):
+                reactor.add_monitor(_CountingMonitor())
+        finally:
+            reactor.stop()
+        self.assertFalse(reactor.is_running())
+
+    def test_samples_all_monitors(self):
+        """One reactor thread feeds every registered monitor's ring"""
+        monitors = [_CountingMonitor(), _CountingMonitor()]
+        reactor = MonitorReactor()
+        for monitor in monitors:
+            reactor.add_monitor(monitor)
+        reactor.start()
+        self.assertTrue(reactor.is_running())
+
+        # Wait (bounded) for the reactor to stage samples for both monitors
+        for _ in range(5000):
+            if all(len(m.snapshot_samples()[0]) for m in monitors):
+                break
+            time.sleep(0.001)
+        reactor.stop()
+
+        for monitor in monitors:
+            self.assertGreater(len(monitor.readings), 0)
+            self.assertEqual(monitor.readings[0].power_watts, 1.0)
+            self.assertEqual(monitor.readings[0].metadata['monitor_type'],
+                             'counting')
+
+    def test_stop_drains_rings(self):
+        """stop() leaves no samples staged in any monitor's ring"""
+        monitor = _CountingMonitor()
+        reactor = MonitorReactor()
+        reactor.add_monitor(monitor)
+        reactor.start()
+        for _ in range(5000):
+            if len(monitor.snapshot_samples()[0]):
+                break
+            time.sleep(0.001)
+        reactor.stop()
+        self.assertEqual(len(monitor.snapshot_samples()[0]), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,99 +4,383 @@
 # pip install -r requirements/base.txt
 # pip install -r requirements/test.txt
 
-import unittest
+import json
 import os
-import tempfile
+import unittest
 from unittest.mock import patch, MagicMock
-from src.power_profiling.monitors.system import IPMIMonitor
+from src.power_profiling.monitors import system
+from src.power_profiling.monitors.system import (
+    SystemMonitor, IPMIMonitor, IpmitoolMonitor, RedfishMonitor
+)
+
+
+def _fake_ipmi():
+    """Patch pyipmi into the system module as a MagicMock namespace."""
+    return patch.multiple(system, IPMI_AVAILABLE=True, pyipmi=MagicMock(),
+                          create=True)
+
+
+def _power_body(watts=500.0, supplies=None):
+    """Build a minimal Redfish Power resource body."""
+    body = {'PowerControl': [{'PowerConsumedWatts': watts}]}
+    if supplies is not None:
+        body['PowerSupplies'] = supplies
+    return body
+
+
+def _response(status_code=200, body=None, etag=None):
+    """Build a fake requests response carrying a JSON body."""
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = json.dumps(body or {}).encode()
+    response.json.return_value = body or {}
+    response.headers = {'ETag': etag} if etag else {}
+    return response
+
+
+class TestSystemMonitor(unittest.TestCase):
+
+    def test_read_power_not_implemented(self):
+        """The abstract base must refuse to read power directly"""
+        monitor = SystemMonitor(sampling_interval=0.1)
+        with self.assertRaises(NotImplementedError):
+            monitor._read_power()
+
+    def test_get_metadata(self):
+        """Abstract metadata carries the type, interval and system info"""
+        monitor = SystemMonitor(sampling_interval=0.1)
+        metadata = monitor._get_metadata()
+        self.assertEqual(metadata['monitor_type'], 'abstract_system')
+        self.assertEqual(metadata['sampling_interval'], 0.1)
+        self.assertIn('system_info', metadata)
+
+    def test_system_info_cached(self):
+        """System info is parsed once per process and copied per monitor"""
+        first = SystemMonitor(sampling_interval=0.1)
+        second = SystemMonitor(sampling_interval=0.1)
+        self.assertEqual(first.system_info, second.system_info)
+        self.assertIsNot(first.system_info, second.system_info)
+
+    def test_metadata_template_is_read_only(self):
+        """The shared template cannot be mutated in place"""
+        monitor = SystemMonitor(sampling_interval=0.1)
+        with self.assertRaises(TypeError):
+            monitor._get_metadata()['monitor_type'] = 'other'
+
+    def test_drained_metadata_is_json_serializable(self):
+        """Drained readings carry plain dicts, not the frozen template"""
+        monitor = SystemMonitor(sampling_interval=0.1)
+        with patch.object(monitor, '_read_power', return_value=400.0):
+            monitor._sample_once()
+            monitor._sample_once()
+        readings = monitor._drain_ring()
+        # json.dumps rejects MappingProxyType; exports must not see it
+        json.dumps([reading.to_dict() for reading in readings])
+        # The thaw keeps the template sharing between readings
+        self.assertIs(readings[0].metadata, readings[1].metadata)
+
+    def test_sample_power_polls_every_tick_by_default(self):
+        """Without a poll_interval each sample queries the sensor"""
+        monitor = SystemMonitor(sampling_interval=0.1)
+        with patch.object(monitor, '_read_power', return_value=400.0) as read:
+            self.assertEqual(monitor._sample_power(), 400.0)
+            self.assertEqual(monitor._sample_power(), 400.0)
+        self.assertEqual(read.call_count, 2)
+
+    def test_sample_power_reuses_value_between_polls(self):
+        """A poll_interval throttles sensor queries below the sample rate"""
+        monitor = SystemMonitor(sampling_interval=0.1, poll_interval=2.0)
+        clock = iter([0.0, 0.1, 0.2, 2.1])
+        with patch.object(system.time, 'monotonic', side_effect=clock), \
+             patch.object(monitor, '_read_power',
+                          side_effect=[400.0, 410.0]) as read:
+            # First tick polls; the next two ride the cached value
+            self.assertEqual(monitor._sample_power(), 400.0)
+            self.assertEqual(monitor._sample_power(), 400.0)
+            self.assertEqual(monitor._sample_power(), 400.0)
+            # Past the poll deadline the sensor is queried again
+            self.assertEqual(monitor._sample_power(), 410.0)
+        self.assertEqual(read.call_count, 2)
+
+    def test_sample_once_honours_poll_interval(self):
+        """Reactor-driven sampling gets the same sensor-poll throttle"""
+        monitor = SystemMonitor(sampling_interval=0.1, poll_interval=2.0)
+        clock = iter([0.0, 0.1, 2.1])
+        with patch.object(system.time, 'monotonic', side_effect=clock), \
+             patch.object(monitor, '_read_power',
+                          side_effect=[400.0, 410.0]) as read:
+            monitor._sample_once()
+            monitor._sample_once()
+            monitor._sample_once()
+        self.assertEqual(read.call_count, 2)
+        self.assertEqual(monitor.snapshot_samples()[1].tolist(),
+                         [400.0, 400.0, 410.0])
+
 
 class TestIPMIMonitor(unittest.TestCase):
-    
+
     def setUp(self):
-        # Create a temporary directory for mock files
-        self.temp_dir = tempfile.TemporaryDirectory()
-        
-    def tearDown(self):
-        # Clean up the temporary directory
-        self.temp_dir.cleanup()
-        
-    def test_initialization_no_ipmi(self):
-        """Test initialization when IPMI is not available"""
-        with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=False):
-            monitor = IPMIMonitor()
-            self.assertFalse(monitor.ipmi_available)
-            
-    def test_initialization_with_ipmi(self):
-        """Test initialization when IPMI is available"""
-        with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=True):
-            monitor = IPMIMonitor()
-            self.assertTrue(monitor.ipmi_available)
-            
-    def test_check_ipmi_available_success(self):
-        """Test successful IPMI availability check"""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=0
-            )
-            available = IPMIMonitor._check_ipmi_available()
-            self.assertTrue(available)
-            
-    def test_check_ipmi_available_failure(self):
-        """Test IPMI availability check failure"""
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                returncode=1
-            )
-            available = IPMIMonitor._check_ipmi_available()
-            self.assertFalse(available)
-            
-    def test_read_power_no_ipmi(self):
-        """Test power reading when IPMI is not available"""
-        with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=False):
-            monitor = IPMIMonitor()
-            power = monitor._read_power()
-            self.assertIsNone(power)
-            
+        # One patcher for the whole test instead of a with-block per
+        # construction; addCleanup unwinds it even on failure
+        patcher = _fake_ipmi()
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.monitor = IPMIMonitor(host='bmc.example')
+
+    def test_initialization_requires_pyipmi(self):
+        """Initialization fails cleanly when pyipmi is not installed"""
+        with patch.object(system, 'IPMI_AVAILABLE', False):
+            with self.assertRaises(ImportError):
+                IPMIMonitor()
+
+    def test_initialization(self):
+        """Initialization connects and extends the metadata template"""
+        self.assertEqual(self.monitor.host, 'bmc.example')
+        self.assertEqual(self.monitor._static_metadata['monitor_type'], 'ipmi')
+        self.assertEqual(self.monitor._static_metadata['ipmi_host'], 'bmc.example')
+
+    def test_forwards_base_monitor_kwargs(self):
+        """poll_interval and ring options reach the base classes"""
+        monitor = IPMIMonitor(host='bmc.example', poll_interval=5.0,
+                              max_samples=128, coalesce=True)
+        self.assertEqual(monitor.poll_interval, 5.0)
+        self.assertEqual(monitor._ring.capacity, 128)
+
     def test_read_power_success(self):
-        """Test successful power reading"""
-        mock_output = "PowerConsumption=500.0"
-        with patch('subprocess.run') as mock_run:
-            mock_run.return_value = MagicMock(
-                stdout=mock_output,
-                returncode=0
-            )
-            
-            with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=True):
-                monitor = IPMIMonitor()
-                power = monitor._read_power()
-                self.assertEqual(power, 500.0)
-                
+        """Power comes from the tenth byte of the raw response"""
+        self.monitor.ipmi.raw_command.return_value = bytes([0] * 9 + [250])
+        self.assertEqual(self.monitor._read_power(), 250)
+
     def test_read_power_failure(self):
-        """Test power reading failure"""
-        with patch('subprocess.run', side_effect=Exception("Test error")):
-            with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=True):
-                monitor = IPMIMonitor()
-                power = monitor._read_power()
-                self.assertIsNone(power)
-                
-    def test_get_metadata(self):
-        """Test getting metadata"""
-        with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=True):
-            monitor = IPMIMonitor()
-            metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'ipmi')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertTrue(metadata['ipmi_available'])
-            
-    def test_get_metadata_no_ipmi(self):
-        """Test metadata collection when IPMI is not available"""
-        with patch.object(IPMIMonitor, '_check_ipmi_available', return_value=False):
-            monitor = IPMIMonitor()
-            metadata = monitor._get_metadata()
-            self.assertEqual(metadata['monitor_type'], 'ipmi')
-            self.assertEqual(metadata['sampling_interval'], 0.1)
-            self.assertFalse(metadata['ipmi_available'])
-            
-            
+        """An IPMI error yields None, not an exception"""
+        self.monitor.ipmi.raw_command.side_effect = Exception('Test error')
+        self.assertIsNone(self.monitor._read_power())
+
+    def test_get_metadata_copies_template_for_sensor(self):
+        """A sensor reading lands in a copy, not the shared template"""
+        self.monitor.ipmi.sensor_get_sensor_reading.return_value = 500.0
+        metadata = self.monitor._get_metadata()
+        self.assertEqual(metadata['power_sensor'], 500.0)
+        self.assertNotIn('power_sensor', self.monitor._static_metadata)
+
+
+# Representative `ipmitool dcmi power reading` output; only the
+# instantaneous line should be picked up
+_IPMITOOL_OUTPUT = (
+    '\n'
+    '    Instantaneous power reading:                   250 Watts\n'
+    '    Minimum during sampling period:                180 Watts\n'
+    '    Maximum during sampling period:                420 Watts\n'
+    '    Average power reading over sample period:      260 Watts\n')
+
+
+def _ipmitool_result(stdout='', returncode=0, stderr=''):
+    """Build a fake subprocess.run result (bytes I/O) for ipmitool."""
+    return MagicMock(stdout=stdout.encode('ascii'),
+                     stderr=stderr.encode('ascii'), returncode=returncode)
+
+
+class TestIpmitoolMonitor(unittest.TestCase):
+
+    def setUp(self):
+        # The binary-lookup patch covers the whole test; addCleanup
+        # unwinds it even on failure
+        patcher = patch.object(system, '_ipmitool_path',
+                               return_value='/usr/bin/ipmitool')
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _make_monitor(self, **kwargs):
+        return IpmitoolMonitor(sampling_interval=0.1, **kwargs)
+
+    def test_initialization_requires_binary(self):
+        """Initialization fails cleanly when ipmitool is not installed"""
+        with patch.object(system, '_ipmitool_path', return_value=None):
+            with self.assertRaises(RuntimeError):
+                IpmitoolMonitor()
+
+    def test_remote_command(self):
+        """A remote host adds the lanplus transport and credentials"""
+        monitor = self._make_monitor(host='bmc.example', username='u',
+                                     password='p')
+        self.assertEqual(monitor._command[:5],
+                         ['/usr/bin/ipmitool', '-I', 'lanplus',
+                          '-H', 'bmc.example'])
+        self.assertEqual(monitor._command[-3:], ['dcmi', 'power', 'reading'])
+        self.assertEqual(monitor._static_metadata['ipmi_host'], 'bmc.example')
+
+    def test_read_power_success(self):
+        """The instantaneous reading is parsed out of the DCMI output"""
+        monitor = self._make_monitor()
+        with patch.object(system.subprocess, 'run',
+                          return_value=_ipmitool_result(_IPMITOOL_OUTPUT)):
+            self.assertEqual(monitor._read_power(), 250.0)
+
+    def test_read_power_failure(self):
+        """A non-zero exit yields None, not an exception"""
+        monitor = self._make_monitor()
+        with patch.object(system.subprocess, 'run',
+                          return_value=_ipmitool_result(
+                              returncode=1, stderr='Unable to establish')):
+            self.assertIsNone(monitor._read_power())
+
+    def test_read_power_unparseable(self):
+        """Output without a power line yields None"""
+        monitor = self._make_monitor()
+        with patch.object(system.subprocess, 'run',
+                          return_value=_ipmitool_result('DCMI not supported')):
+            self.assertIsNone(monitor._read_power())
+
+    def test_read_power_via_shell(self):
+        """With use_shell the pooled shell is asked, not subprocess.run"""
+        monitor = self._make_monitor(use_shell=True)
+        shell = MagicMock()
+        shell.command.return_value = _IPMITOOL_OUTPUT
+        with patch.object(system, '_get_ipmi_shell',
+                          return_value=shell) as get_shell, \
+             patch.object(system.subprocess, 'run') as mock_run:
+            self.assertEqual(monitor._read_power(), 250.0)
+        mock_run.assert_not_called()
+        get_shell.assert_called_once_with(monitor._shell_argv)
+        shell.command.assert_called_once_with(
+            'dcmi power reading', timeout=monitor.request_timeout)
+
+    def test_shell_pooled_per_bmc(self):
+        """Monitors against one BMC share a single ipmitool shell"""
+        argv = ['/usr/bin/ipmitool', '-I', 'lanplus', '-H', 'bmc.example',
+                'shell']
+        other = ['/usr/bin/ipmitool', '-I', 'lanplus', '-H', 'bmc2.example',
+                 'shell']
+        with patch.object(system, '_IpmiShell', side_effect=lambda a: MagicMock()):
+            try:
+                first = system._get_ipmi_shell(argv)
+                second = system._get_ipmi_shell(argv)
+                third = system._get_ipmi_shell(other)
+            finally:
+                system._ipmi_shell_pool.clear()
+        self.assertIs(first, second)
+        self.assertIsNot(first, third)
+
+    def test_dead_shell_evicted_from_pool(self):
+        """A shell whose subprocess exited is replaced, not reused"""
+        argv = ['/usr/bin/ipmitool', 'shell']
+        dead = MagicMock()
+        dead.alive.return_value = False
+        with patch.object(system, '_IpmiShell', side_effect=lambda a: MagicMock()):
+            try:
+                system._ipmi_shell_pool[tuple(argv)] = dead
+                replacement = system._get_ipmi_shell(argv)
+            finally:
+                system._ipmi_shell_pool.clear()
+        dead.close.assert_called_once_with()
+        self.assertIsNot(replacement, dead)
+
+    def test_shell_command_timeout_kills_shell(self):
+        """A BMC that stops answering times out; the shell is discarded"""
+        shell = system._IpmiShell(['sh', '-c', 'printf "ipmitool> "; sleep 30'])
+        with self.assertRaises(system.subprocess.TimeoutExpired):
+            shell.command('dcmi power reading', timeout=0.2)
+        # The timed-out shell was closed so the pool can replace it
+        shell._proc.wait(timeout=2.0)
+        self.assertFalse(shell.alive())
+
+    def test_shell_death_raises(self):
+        """A shell that exits surfaces an error instead of empty output"""
+        shell = system._IpmiShell(['sh', '-c', 'printf "ipmitool> "'])
+        shell._proc.wait(timeout=2.0)
+        with self.assertRaises(OSError):
+            shell.command('dcmi power reading', timeout=1.0)
+
+
+class TestRedfishMonitor(unittest.TestCase):
+
+    def setUp(self):
+        # Isolate the per-BMC session pool between tests
+        system._redfish_session_pool.clear()
+
+    def tearDown(self):
+        system._redfish_session_pool.clear()
+
+    def _make_monitor(self, **kwargs):
+        kwargs.setdefault('host', 'bmc.example')
+        monitor = RedfishMonitor(sampling_interval=0.1, **kwargs)
+        monitor.session = MagicMock()
+        return monitor
+
+    def test_initialization_requires_host(self):
+        """Initialization fails without a host argument or environment"""
+        with patch.dict(os.environ, {}, clear=True):
+            with self.assertRaises(ValueError):
+                RedfishMonitor()
+
+    def test_initialization(self):
+        """Initialization builds the power URL and metadata template"""
+        monitor = self._make_monitor(chassis_id='Chassis-1')
+        self.assertEqual(
+            monitor.power_url,
+            'https://bmc.example/redfish/v1/Chassis/Chassis-1/Power')
+        self.assertEqual(monitor._static_metadata['monitor_type'], 'redfish')
+        self.assertEqual(monitor._static_metadata['redfish_host'], 'bmc.example')
+
+    def test_initialization_with_expand(self):
+        """expand=True asks for inlined subresources in one round-trip"""
+        monitor = self._make_monitor(expand=True)
+        self.assertEqual(
+            monitor.power_url,
+            'https://bmc.example/redfish/v1/Chassis/System.Embedded.1/Power'
+            '?$expand=.($levels=1)')
+
+    def test_session_pooled_per_bmc(self):
+        """Monitors against one BMC share a single session"""
+        first = RedfishMonitor(host='bmc.example', username='u', password='p')
+        second = RedfishMonitor(host='bmc.example', username='u', password='p')
+        other = RedfishMonitor(host='bmc2.example', username='u', password='p')
+        self.assertIs(first.session, second.session)
+        self.assertIsNot(first.session, other.session)
+
+    def test_read_power(self):
+        """Power comes from PowerConsumedWatts and the ETag is retained"""
+        monitor = self._make_monitor()
+        monitor.session.get.return_value = _response(
+            body=_power_body(watts=425.0), etag='"abc"')
+        self.assertEqual(monitor._read_power(), 425.0)
+        self.assertEqual(monitor._last_etag, '"abc"')
+
+    def test_read_power_not_modified(self):
+        """A 304 revalidation reuses the previous reading and body"""
+        monitor = self._make_monitor()
+        monitor.session.get.return_value = _response(
+            body=_power_body(watts=425.0), etag='"abc"')
+        monitor._read_power()
+        monitor.session.get.return_value = _response(status_code=304)
+        self.assertEqual(monitor._read_power(), 425.0)
+        headers = monitor.session.get.call_args.kwargs['headers']
+        self.assertEqual(headers['If-None-Match'], '"abc"')
+
+    def test_read_power_failure(self):
+        """A transport error yields None, not an exception"""
+        monitor = self._make_monitor()
+        monitor.session.get.side_effect = Exception('Test error')
+        self.assertIsNone(monitor._read_power())
+
+    def test_get_metadata_power_supplies(self):
+        """Power-supply state rides along on the fetched power body"""
+        supplies = [{'Name': 'PSU1', 'Status': {'State': 'Enabled'},
+                     'LastPowerOutputWatts': 220.0}]
+        monitor = self._make_monitor()
+        monitor.session.get.return_value = _response(
+            body=_power_body(supplies=supplies))
+        monitor._read_power()
+        metadata = monitor._get_metadata()
+        self.assertEqual(metadata['power_supplies'], [
+            {'name': 'PSU1', 'state': 'Enabled', 'output_watts': 220.0}])
+        self.assertNotIn('power_supplies', monitor._static_metadata)
+
+    def test_get_metadata_without_body(self):
+        """Before the first fetch, the cached template is returned as-is"""
+        monitor = self._make_monitor()
+        self.assertIs(monitor._get_metadata(), monitor._static_metadata)
+
+
 if __name__ == '__main__':
-    unittest.main() 
\ No newline at end of file
+    unittest.main()